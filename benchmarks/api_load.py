@@ -0,0 +1,144 @@
+"""Latency and throughput of the JSON draft API under concurrent games.
+
+Starts a local API server (or uses --url), then keeps --clients keep-alive
+connections busy, each playing whole games: create, then for every pick
+the state, the options of the first open slot and the pick, then the
+result. Reports requests/s and p50/p99 latency per endpoint.
+
+    python benchmarks/api_load.py --clients 32 --seconds 10
+    python benchmarks/api_load.py --url http://127.0.0.1:8601 --out api.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Client:
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload
+        )
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length) if length else b""
+        return status, json.loads(data) if data else None
+
+
+async def play(client: Client, latencies: dict, deadline: float, rng: random.Random):
+    async def call(name, method, path, body=None):
+        t = time.perf_counter()
+        status, data = await client.request(method, path, body)
+        latencies[name].append(time.perf_counter() - t)
+        if status >= 400:
+            latencies["errors"].append(status)
+        return data
+
+    while time.perf_counter() < deadline:
+        state = await call("create", "POST", "/games", {"mode": rng.choice(["hitters", "pitchers"])})
+        gid = state["id"]
+        while not state["over"] and time.perf_counter() < deadline:
+            state = await call("state", "GET", f"/games/{gid}")
+            mine = state["rosters"][state["on_clock"]]
+            slot = next(s for s in state["slots"] if mine[s] is None)
+            opts = await call("options", "GET", f"/games/{gid}/options?slot={quote(slot)}")
+            if not opts["players"]:
+                break
+            moved = await call("pick", "POST", f"/games/{gid}/picks", {"slot": slot, "player": opts["players"][0]})
+            state = moved["state"] if moved and "state" in moved else state
+        if state["over"]:
+            await call("result", "GET", f"/games/{gid}/result")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run(host: str, port: int, clients: int, seconds: float, seed: int) -> dict:
+    latencies = defaultdict(list)
+    deadline = time.perf_counter() + seconds
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *(play(Client(host, port), latencies, deadline, random.Random(seed + i)) for i in range(clients))
+    )
+    elapsed = time.perf_counter() - t0
+
+    report = {"clients": clients, "seconds": round(elapsed, 2), "errors": len(latencies.pop("errors", []))}
+    all_ms = sorted(x * 1000 for v in latencies.values() for x in v)
+    report["requests_per_s"] = round(len(all_ms) / elapsed)
+    report["games_per_s"] = round(len(latencies["result"]) / elapsed, 1)
+    for name, values in [("all", all_ms)] + [(k, sorted(x * 1000 for x in v)) for k, v in latencies.items()]:
+        report[name] = {
+            "n": len(values),
+            "p50_ms": round(statistics.median(values), 2),
+            "p99_ms": round(values[min(len(values) - 1, int(len(values) * 0.99))], 2),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="API to load; by default a local one is started")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "war_draft.api", "--host", host, "--port", str(port)],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        server.stdout.readline()  # the server prints once it is listening
+    try:
+        report = asyncio.run(run(host, port, args.clients, args.seconds, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{report['requests_per_s']} requests/s, {report['games_per_s']} games/s, {report['errors']} errors")
+    print(f"{'endpoint':<10}{'n':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for name in ("all", "create", "state", "options", "pick", "result"):
+        if name in report:
+            r = report[name]
+            print(f"{name:<10}{r['n']:>9}{r['p50_ms']:>9}{r['p99_ms']:>9}")
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
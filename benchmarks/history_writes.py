@@ -0,0 +1,114 @@
+"""Finished games per second the history writer can store.
+
+Plays a set of random finished games, then submits them to a fresh
+history file as one burst, the way many sessions reaching the winner
+screen together would. It reports what the caller pays per record()
+(the snapshot, then queueing it, in microseconds) and how many games per
+second the writer thread stores, for each batch size. keeps_up compares
+that with --peak.
+
+    python benchmarks/history_writes.py --games 5000 --batch 1 16 256
+    python benchmarks/history_writes.py --games 5000 --peak 500 --out hist.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from war_draft import engine, history  # noqa: E402
+from war_draft.data import load_hitter_pool, load_pitch_pool  # noqa: E402
+from war_draft.index import hitter_index, pitch_index  # noqa: E402
+
+
+def finished_games(n: int, seed: int) -> list:
+    hitters = engine.HITTERS, hitter_index(load_hitter_pool())
+    pitchers = engine.PITCHERS, pitch_index(load_pitch_pool())
+    rng = random.Random(seed)
+    games = []
+    for i in range(n):
+        rules, index = hitters if i % 2 == 0 else pitchers
+        state = engine.new_game(rules, index, seed=rng.randrange(2**32))
+        while not engine.is_over(state):
+            engine.apply_move(state, rng.choice(engine.legal_moves(state)))
+        games.append(state)
+    return games
+
+
+def run(games: list, batch: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "history.sqlite3")
+        history.connect(path).close()
+        writer = history.Writer(path, batch=batch)
+
+        snapshot_us, records = [], []
+        for i, state in enumerate(games):
+            t = time.perf_counter()
+            records.append(history.snapshot(state, "B" if i % 3 == 0 else None))
+            snapshot_us.append((time.perf_counter() - t) * 1e6)
+
+        submit_us = []
+        t0 = time.perf_counter()
+        for rec in records:
+            t = time.perf_counter()
+            writer.submit(rec)
+            submit_us.append((time.perf_counter() - t) * 1e6)
+        writer.flush()
+        elapsed = time.perf_counter() - t0
+
+        conn = history.connect(path)
+        stored = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        t = time.perf_counter()
+        history.top_totals(conn, "hitters", 10)
+        history.most_drafted(conn, "hitters", "yankees", 10)
+        history.average_by_slot(conn, "pitchers")
+        query_ms = (time.perf_counter() - t) * 1000
+        conn.close()
+
+    snapshot_us.sort()
+    submit_us.sort()
+    return {
+        "batch": batch,
+        "games": stored,
+        "games_per_s": round(stored / elapsed),
+        "snapshot_us_p50": round(statistics.median(snapshot_us), 1),
+        "submit_us_p50": round(statistics.median(submit_us), 1),
+        "submit_us_p99": round(submit_us[int(len(submit_us) * 0.99)], 1),
+        "queries_ms": round(query_ms, 2),
+        "failed": writer.failed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 16, history.BATCH])
+    parser.add_argument("--peak", type=int, default=200, help="games finishing per second to keep up with")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    games = finished_games(args.games, args.seed)
+    rows = []
+    for batch in args.batch:
+        row = run(games, batch)
+        row["keeps_up"] = row["games_per_s"] >= args.peak
+        rows.append(row)
+
+    keys = list(rows[0])
+    print("".join(f"{k:>16}" for k in keys))
+    for r in rows:
+        print("".join(f"{r[k]!s:>16}" for k in keys))
+    if args.out:
+        args.out.write_text(json.dumps(rows, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Cost of one pick's bookkeeping as leagues grow from 2 to 12 drafters.
+
+Plays --games full drafts per league size and mode. Each pick goes to a
+random open slot and a random name on offer there (or passes when the
+drafter has nothing left). It times apply_move, which checks and records
+the round's used seasons and taken players, and the avail lookup a rerun
+makes after it. rebuild_us is what that lookup cost when it was rebuilt
+by scanning every roster, for comparison; it grows with the league.
+
+    python benchmarks/league_picks.py --games 200
+    python benchmarks/league_picks.py --drafters 2 6 12 --out leagues.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from war_draft import engine  # noqa: E402
+from war_draft.availability import DraftAvailability  # noqa: E402
+from war_draft.data import load_hitter_pool, load_pitch_pool  # noqa: E402
+from war_draft.index import hitter_index, pitch_index  # noqa: E402
+
+
+def full_scan(state):
+    # The avail view as it was rebuilt before: every slot of every roster.
+    avail = DraftAvailability()
+    tid = state.round_team_id
+    picks, n_slots = state.picks, len(state.rules.slots)
+    for r, letter in enumerate(state.letters):
+        for i in range(3 * r * n_slots, 3 * (r + 1) * n_slots, 3):
+            if picks[i + 1] == tid:
+                player = state.index.player_name(picks[i])
+                avail.mark_used(player, state.rules.data_slots[picks[i + 2]])
+                avail.mark_taken(letter, player)
+    return avail
+
+
+def pct(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run(rules, index, drafters: int, games: int, rng: random.Random) -> dict:
+    pick_us, avail_us, rebuild_us = [], [], []
+    passes = 0
+    for _ in range(games):
+        state = engine.new_game(rules, index, seed=rng.randrange(2**32), drafters=drafters)
+        index.warm(state.index.teams[tid] for tid in state.order)
+        while not engine.is_over(state):
+            letter = engine.current_picker(state)
+            slots = engine.empty_slots(state, letter)
+            rng.shuffle(slots)
+            move = None
+            for slot in slots:
+                opts = engine.options(state, slot, letter)
+                if opts:
+                    move = engine.Move(slot, rng.choice(opts)[0])
+                    break
+            if move is None:
+                engine.pass_pick(state)
+                passes += 1
+                continue
+
+            t = time.perf_counter()
+            engine.apply_move(state, move)
+            pick_us.append((time.perf_counter() - t) * 1e6)
+
+            t = time.perf_counter()
+            state.avail.is_taken(letter, move.player)
+            avail_us.append((time.perf_counter() - t) * 1e6)
+
+            t = time.perf_counter()
+            full_scan(state).is_taken(letter, move.player)
+            rebuild_us.append((time.perf_counter() - t) * 1e6)
+
+    return {
+        "mode": rules.name,
+        "drafters": drafters,
+        "picks": len(pick_us),
+        "passes": passes,
+        "pick_us_p50": round(statistics.median(pick_us), 2),
+        "pick_us_p99": round(pct(pick_us, 0.99), 2),
+        "avail_us_p50": round(statistics.median(avail_us), 2),
+        "rebuild_us_p50": round(statistics.median(rebuild_us), 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drafters", type=int, nargs="+", default=[2, 3, 4, 6, 8, 10, 12])
+    parser.add_argument("--games", type=int, default=100, help="drafts per league size and mode")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    modes = [
+        (engine.HITTERS, hitter_index(load_hitter_pool())),
+        (engine.PITCHERS, pitch_index(load_pitch_pool())),
+    ]
+    rng = random.Random(args.seed)
+    rows = [run(rules, index, n, args.games, rng) for rules, index in modes for n in args.drafters]
+
+    cols = list(rows[0])
+    print("  ".join(f"{c:>14}" for c in cols))
+    for row in rows:
+        print("  ".join(f"{row[c]:>14}" for c in cols))
+    if args.out:
+        args.out.write_text(json.dumps(rows, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
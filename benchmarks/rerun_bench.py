@@ -0,0 +1,221 @@
+"""Scripted full games through both Streamlit apps with AppTest.
+
+Every game resets the board (team draws are seeded), drafts the alphabetically first option in the
+first open slot until the winner screen shows, and records wall time per
+rerun, time spent in the hot engine calls and peak traced memory.
+
+    python benchmarks/rerun_bench.py --games 3 --out bench.json
+    python benchmarks/rerun_bench.py --games 3 --baseline bench.json --threshold 0.25
+
+Compare reports taken with the same --games and --seed.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from functools import wraps
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# Benchmark games stay out of the real history file (and its leaderboard).
+os.environ["WAR_DRAFT_HISTORY"] = ""
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from war_draft import engine  # noqa: E402
+
+APPS = {
+    "hitters": ROOT / "app.py",
+    "pitchers": ROOT / "pitching_app.py",
+}
+
+# phase name -> engine attribute. Apps look these up on the module at call
+# time, so wrapping the module attribute times every call they make.
+# Phases nest (options and apply_move both resolve the round pool), so
+# each figure is inclusive.
+PHASES = {
+    "round_pool": "round_pool",
+    "options_for_slot": "options",
+    "apply_pick": "apply_move",
+}
+
+# Regressions are judged on these report keys.
+GATED = ("rerun_ms_p50", "rerun_ms_p95", "options_for_slot_ms", "round_pool_ms", "apply_pick_ms")
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.totals = {name: 0.0 for name in PHASES}
+        self.calls = {name: 0 for name in PHASES}
+        self._orig = {}
+
+    def reset(self):
+        self.totals = dict.fromkeys(self.totals, 0.0)
+        self.calls = dict.fromkeys(self.calls, 0)
+
+    def install(self):
+        for name, attr in PHASES.items():
+            fn = getattr(engine, attr)
+            self._orig[attr] = fn
+            setattr(engine, attr, self._wrap(name, fn))
+
+    def uninstall(self):
+        for attr, fn in self._orig.items():
+            setattr(engine, attr, fn)
+        self._orig = {}
+
+    def _wrap(self, name, fn):
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.totals[name] += time.perf_counter() - t0
+                self.calls[name] += 1
+
+        return timed
+
+
+def seeded_games(seed: int):
+    # Make every game the apps start reproducible.
+    orig = engine.new_game
+    seeds = random.Random(seed)
+
+    def new_game(rules, index, teams=None, rng=None, **kwargs):
+        kwargs["seed"] = seeds.randrange(2**32)
+        return orig(rules, index, teams, **kwargs)
+
+    engine.new_game = new_game
+    return orig
+
+
+def play_game(at: AppTest, rerun_ms: list):
+    def run(el):
+        t0 = time.perf_counter()
+        el.run()
+        rerun_ms.append((time.perf_counter() - t0) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    reset = next(b for b in at.button if b.label == "reset game")
+    run(reset.click())
+
+    picks = 0
+    while not at.header:
+        boxes = [s for s in at.selectbox if not s.disabled and len(s.options) > 1]
+        if not boxes:
+            raise RuntimeError("No pickable slot before the winner screen.")
+        run(boxes[0].set_value(boxes[0].options[1]))
+        picks += 1
+    return picks
+
+
+def bench_app(mode: str, games: int, seed: int, warmup: int = 1) -> dict:
+    timer = PhaseTimer()
+    orig_new_game = seeded_games(seed)
+    timer.install()
+    rerun_ms = []
+    picks = 0
+    try:
+        t0 = time.perf_counter()
+        at = AppTest.from_file(str(APPS[mode]), default_timeout=120)
+        at.run()
+        cold_ms = (time.perf_counter() - t0) * 1000
+        for _ in range(warmup):
+            play_game(at, [])
+        timer.reset()
+        for _ in range(games):
+            picks += play_game(at, rerun_ms)
+
+        # Tracing slows every allocation down, so memory gets its own
+        # untimed game.
+        timer.uninstall()
+        tracemalloc.start()
+        play_game(AppTest.from_file(str(APPS[mode]), default_timeout=120).run(), [])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        timer.uninstall()
+        engine.new_game = orig_new_game
+
+    n = len(rerun_ms)
+    report = {
+        "games": games,
+        "seed": seed,
+        "picks": picks,
+        "reruns": n,
+        "cold_start_ms": round(cold_ms, 2),
+        "rerun_ms_p50": round(statistics.median(rerun_ms), 3),
+        "rerun_ms_p95": round(sorted(rerun_ms)[int(0.95 * (n - 1))], 3),
+        "rerun_ms_max": round(max(rerun_ms), 3),
+        "peak_mem_mb": round(peak / 2**20, 2),
+    }
+    for name in PHASES:
+        # average time per rerun spent in the phase
+        report[f"{name}_ms"] = round(timer.totals[name] * 1000 / n, 4)
+        report[f"{name}_calls"] = timer.calls[name]
+    return report
+
+
+def print_table(results: dict, baseline: dict = None):
+    keys = list(next(iter(results.values())).keys())
+    header = f"{'metric':<24}" + "".join(f"{m:>20}" for m in results)
+    print(header)
+    print("-" * len(header))
+    for k in keys:
+        row = f"{k:<24}"
+        for mode, r in results.items():
+            cell = f"{r[k]}"
+            if baseline and mode in baseline and k in GATED and baseline[mode].get(k):
+                change = (r[k] - baseline[mode][k]) / baseline[mode][k]
+                cell += f" ({change:+.0%})"
+            row += f"{cell:>20}"
+        print(row)
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list:
+    out = []
+    for mode, r in results.items():
+        base = baseline.get(mode, {})
+        for k in GATED:
+            if base.get(k) and r[k] > base[k] * (1 + threshold):
+                out.append(f"{mode}.{k}: {base[k]} -> {r[k]}")
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", nargs="+", choices=sorted(APPS), default=sorted(APPS))
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--warmup", type=int, default=1, help="untimed games played first")
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = {mode: bench_app(mode, args.games, args.seed, args.warmup) for mode in args.apps}
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    print_table(results, baseline)
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2) + "\n")
+
+    if baseline:
+        failed = regressions(results, baseline, args.threshold)
+        if failed:
+            print("\nRegressions over threshold:")
+            for line in failed:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Fan-out latency of multiplayer rooms with many bot-driven rooms at once.
+
+Starts a local room server (or uses --url), opens --rooms rooms with two
+bot clients each and plays every room to the end. A bot on the clock asks
+for its first open slot's options and picks the first name after --think
+seconds. Fan-out latency is the time from a pick being sent to the
+opponent receiving the state that shows it. Also reports the server's RSS
+before and after the rooms open.
+
+    python benchmarks/room_fanout.py --rooms 1000 --think 0.2
+    python benchmarks/room_fanout.py --rooms 2000 --think 0.5 --out rooms.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from websockets.asyncio.client import connect
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+async def bot(url: str, first: dict, sent: dict, fanout: list, think: float, joined=None):
+    # Plays one seat until the draft is over. sent maps (room, seq) to when
+    # the pick that brings the room to seq was sent.
+    async with connect(url, compression=None, max_size=None, open_timeout=60) as ws:
+        await ws.send(json.dumps(first))
+        seat = code = None
+        seq = 0
+        async for raw in ws:
+            msg = json.loads(raw)
+            kind = msg["type"]
+            if kind == "joined":
+                seat, code = msg["seat"], msg["room"]
+                if joined is not None:
+                    joined.set_result(code)
+            elif kind == "error":
+                raise RuntimeError(msg["error"])
+            elif kind == "state":
+                event, state, seq = msg.get("event"), msg["state"], msg["seq"]
+                if event and event["roster"] != seat:
+                    fanout.append(time.perf_counter() - sent.pop((code, seq)))
+                if state["over"]:
+                    return
+                if state["on_clock"] == seat and all(msg["seats"].values()):
+                    mine = state["rosters"][seat]
+                    slot = next(s for s in state["slots"] if mine[s] is None)
+                    await ws.send(json.dumps({"type": "options", "slot": slot}))
+            elif kind == "options":
+                if think:
+                    await asyncio.sleep(think)
+                sent[(code, seq + 1)] = time.perf_counter()
+                await ws.send(json.dumps({"type": "pick", "slot": msg["slot"], "player": msg["players"][0]}))
+
+
+async def play_room(url: str, mode: str, sent: dict, fanout: list, think: float, opened: list):
+    joined = asyncio.get_running_loop().create_future()
+    host = asyncio.ensure_future(bot(url, {"type": "create", "mode": mode}, sent, fanout, think, joined))
+    code = await joined
+    guest = asyncio.ensure_future(bot(url, {"type": "join", "room": code}, sent, fanout, think))
+    opened.append(code)
+    await asyncio.gather(host, guest)
+
+
+async def run(url: str, rooms: int, think: float, seed: int, server_pid: int = None) -> dict:
+    rng = random.Random(seed)
+    sent, fanout, opened = {}, [], []
+    report = {"rooms": rooms, "think_s": think}
+    if server_pid:
+        report["server_rss_mb_idle"] = rss_mb(server_pid)
+
+    t0 = time.perf_counter()
+    cpu0 = cpu_s(server_pid) if server_pid else 0.0
+    games = [
+        asyncio.ensure_future(play_room(url, rng.choice(["hitters", "pitchers"]), sent, fanout, think, opened))
+        for _ in range(rooms)
+    ]
+    while len(opened) < rooms and not all(g.done() for g in games):
+        await asyncio.sleep(0.05)
+    if server_pid:
+        report["server_rss_mb_open"] = rss_mb(server_pid)
+    await asyncio.gather(*games)
+    elapsed = time.perf_counter() - t0
+
+    ms = sorted(x * 1000 for x in fanout)
+    report.update(
+        {
+            "picks": len(ms),
+            "seconds": round(elapsed, 2),
+            "picks_per_s": round(len(ms) / elapsed),
+            "fanout_p50_ms": round(statistics.median(ms), 2),
+            "fanout_p99_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.99))], 2),
+            "fanout_max_ms": round(ms[-1], 2),
+        }
+    )
+    if server_pid:
+        # Near 1.0 means the server's event loop, not the bots, set the pace.
+        report["server_cpu_share"] = round((cpu_s(server_pid) - cpu0) / elapsed, 2)
+        report["server_kb_per_room"] = round(
+            (report["server_rss_mb_open"] - report["server_rss_mb_idle"]) * 1024 / rooms, 1
+        )
+    return report
+
+
+def rss_mb(pid: int) -> float:
+    for line in open(f"/proc/{pid}/status"):
+        if line.startswith("VmRSS:"):
+            return round(int(line.split()[1]) / 1024, 1)
+    return 0.0
+
+
+def cpu_s(pid: int) -> float:
+    # user + system CPU seconds of a process
+    fields = open(f"/proc/{pid}/stat").read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="ws:// URL of a running room server; by default a local one is started")
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--think", type=float, default=0.2, help="seconds a bot waits before each pick")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "war_draft.rooms", "--port", str(port)],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        server.stdout.readline()  # the server prints once it is listening
+        url = f"ws://127.0.0.1:{port}/ws"
+    try:
+        report = asyncio.run(run(url, args.rooms, args.think, args.seed, server.pid if server else None))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    for k, v in report.items():
+        print(f"{k:<22}{v}")
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Bytes of server memory held per active draft.
+
+Builds many games at random points of the draft, keeps them all alive the
+way concurrent Streamlit sessions would, and divides the traced memory
+freed by dropping them by the number of games. Growth that outlives the
+games (option caches, interned names) is shared by every session and is
+reported separately.
+
+    python benchmarks/session_memory.py --sessions 2000
+    python benchmarks/session_memory.py --sessions 2000 --out mem.json
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from war_draft import engine  # noqa: E402
+from war_draft.data import load_hitter_pool, load_pitch_pool  # noqa: E402
+from war_draft.index import hitter_index, pitch_index  # noqa: E402
+
+
+def load(mode: str):
+    if mode == "hitters":
+        return engine.HITTERS, hitter_index(load_hitter_pool())
+    return engine.PITCHERS, pitch_index(load_pitch_pool())
+
+
+def play(state, picks: int, rng: random.Random):
+    # Random legal picks, also rendering the on-the-clock options the way
+    # the app does on every rerun.
+    for _ in range(picks):
+        if engine.is_over(state):
+            break
+        letter = engine.current_picker(state)
+        for slot in engine.empty_slots(state, letter):
+            engine.options(state, slot, letter)
+        engine.apply_move(state, rng.choice(engine.legal_moves(state)))
+    return state
+
+
+def measure(mode: str, sessions: int, stage: str, seed: int) -> tuple:
+    # (bytes held per session, bytes of shared structures the games grew)
+    rules, index = load(mode)
+    n_picks = 2 * len(rules.slots)
+    picks_for = {
+        "start": lambda r: 0,
+        "mid": lambda r: r.randrange(1, n_picks),
+        "end": lambda r: n_picks,
+    }[stage]
+
+    # Warm the index the games draw from.
+    index.warm()
+    play(engine.new_game(rules, index), n_picks, random.Random(seed))
+
+    # Games are created the way the apps create them (no per-game RNG).
+    rng = random.Random(seed)
+    random.seed(seed)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    games = [play(engine.new_game(rules, index), picks_for(rng), rng) for _ in range(sessions)]
+    gc.collect()
+    with_games, _ = tracemalloc.get_traced_memory()
+    # What survives the games is shared (caches, interned names), not per-session.
+    del games
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (with_games - after) / sessions, after - before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", nargs="+", choices=["hitters", "pitchers"], default=["hitters", "pitchers"])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = {}
+    print(f"{'mode':<10}{'stage':<8}{'bytes/session':>15}{'sessions/GiB':>15}{'shared KiB':>12}")
+    for mode in args.apps:
+        report[mode] = {}
+        for stage in ("start", "mid", "end"):
+            per, shared = measure(mode, args.sessions, stage, args.seed)
+            report[mode][f"{stage}_bytes"] = round(per)
+            report[mode][f"{stage}_shared_bytes"] = shared
+            print(f"{mode:<10}{stage:<8}{per:>15,.0f}{2**30 / per:>15,.0f}{shared / 1024:>12,.0f}")
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Memory of N worker processes that each load and index both pools.
+
+Every worker imports the data layer, loads both pools, warms both indexes
+and reports its smaps totals. Pages mapped from the columnar build are
+shared by all workers, so PSS per worker falls as workers are added while
+the private part stays put. With --csv every worker parses the CSVs itself.
+
+    python -m war_draft.build
+    python benchmarks/worker_memory.py --workers 1 2 4 8
+    python benchmarks/worker_memory.py --workers 1 4 --csv
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORKER = """
+import json, sys, time
+t0 = time.perf_counter()
+from war_draft import data, index
+use_build = sys.argv[1] == "build"
+index.hitter_index(data.load_hitter_pool(use_build=use_build)).warm()
+index.pitch_index(data.load_pitch_pool(use_build=use_build)).warm()
+ready_ms = (time.perf_counter() - t0) * 1000
+totals = {}
+for line in open("/proc/self/smaps_rollup"):
+    parts = line.split()
+    if len(parts) >= 3 and parts[0].endswith(":"):
+        totals[parts[0][:-1]] = int(parts[1])
+print(json.dumps({"ready_ms": ready_ms, "pandas": "pandas" in sys.modules, **totals}), flush=True)
+sys.stdin.read()
+"""
+
+
+def run(workers: int, use_build: bool) -> dict:
+    # Start all workers, wait until each is loaded, then read them while
+    # they are all still alive so shared pages are counted across them.
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER, "build" if use_build else "csv"],
+            cwd=ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(workers)
+    ]
+    try:
+        reports = [json.loads(p.stdout.readline()) for p in procs]
+        time.sleep(0.2)
+    finally:
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+
+    def mb(key):
+        return sum(r[key] for r in reports) / 1024
+
+    private = mb("Private_Clean") + mb("Private_Dirty")
+    return {
+        "workers": workers,
+        "source": "build" if use_build else "csv",
+        "pandas_imported": any(r["pandas"] for r in reports),
+        "ready_ms": round(max(r["ready_ms"] for r in reports), 1),
+        "rss_mb": round(mb("Rss"), 1),
+        "pss_mb": round(mb("Pss"), 1),
+        "private_mb": round(private, 1),
+        "private_mb_per_worker": round(private / workers, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--csv", action="store_true", help="parse the CSVs instead of mapping the build")
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    rows = [run(n, not args.csv) for n in args.workers]
+    keys = list(rows[0])
+    print("".join(f"{k:>22}" for k in keys))
+    for r in rows:
+        print("".join(f"{r[k]!s:>22}" for k in keys))
+    if args.out:
+        args.out.write_text(json.dumps(rows, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,16 @@
-import random
-import base64
-from pathlib import Path
 from textwrap import dedent
 
-import pandas as pd
 import streamlit as st
 
-# ----------------------------
-# Paths
-# ----------------------------
-BASE_DIR = Path(__file__).parent
-LOGO_DIR = BASE_DIR / "logos"
+from war_draft import analytics, bot, engine, history, logos, prefetch, profiling, reload, search, solver
+from war_draft.data import PoolError
+from war_draft.engine import IllegalMove, Move
 
 # ----------------------------
 # Page config
 # ----------------------------
 st.set_page_config(page_title="Pitching WAR Draft", layout="wide")
+profiling.begin_rerun(st)
 
 # ----------------------------
 # Rules dialog state
@@ -41,6 +36,8 @@ Example: Nationals Max Scherzer is different from Tigers Max Scherzer.
 
 No utility slot.
 Each team drafts 7 pitchers.
+
+Single player: turn on "vs computer" and the computer drafts for Team B.
         """
     )
 
@@ -93,6 +90,24 @@ st.markdown(
           font-weight: 600;
           opacity: 0.95;
         }
+
+        .board-row{
+          display: grid;
+          grid-template-columns: 1fr 9fr;
+          gap: 1rem;
+          align-items: center;
+          margin-bottom: 0.35rem;
+        }
+        .board-row .picked-pill{ margin: 0; }
+        .open-slot{
+          min-height: 42px;
+          display: flex;
+          align-items: center;
+          padding: 0 0.75rem;
+          border-radius: 0.5rem;
+          opacity: 0.5;
+          border: 1px solid rgba(255,255,255,0.12);
+        }
         </style>
         """
     ),
@@ -111,22 +126,17 @@ if st.session_state.show_rules_p:
 # ----------------------------
 # Data
 # ----------------------------
-df = pd.read_csv("pitch_game_pool.csv")
-
-required_cols = {"team", "player", "war"}
-missing = required_cols - set(df.columns)
-if missing:
-    st.error(f"pitch_game_pool.csv is missing columns: {missing}")
+# The current version of the pool; edits to the CSV are picked up in the
+# background (war_draft.reload) and games in progress keep their own.
+try:
+    index = reload.provider("pitchers").index()
+except PoolError as e:
+    st.error(str(e))
     st.stop()
 
-df["team"] = df["team"].astype(str).str.strip().str.lower()
-df["player"] = df["player"].astype(str).str.strip()
-df["war"] = pd.to_numeric(df["war"], errors="coerce")
-df = df.dropna(subset=["team", "player", "war"])
-
-teams_all = sorted(df["team"].unique().tolist())
-
-PITCH_SLOTS = ["p1", "p2", "p3", "p4", "p5", "p6", "p7"]
+BOT_LETTER = "B"
+RULES = engine.PITCHERS
+PITCH_SLOTS = list(RULES.slots)
 
 TEAM_COLORS = {
     "nationals": "#0C2340",
@@ -167,170 +177,137 @@ def team_color(team_name: str) -> str:
     return TEAM_COLORS.get(t, "#1F6F43")
 
 
-def roster_total(roster: dict) -> float:
-    total = 0.0
-    for v in roster.values():
-        if v is not None:
-            total += float(v["war"])
-    return total
+def query_seed():
+    # ?seed=N replays the same round teams; anything else draws a random one
+    try:
+        seed = int(st.query_params["seed"])
+    except (KeyError, ValueError):
+        return None
+    return seed if 0 <= seed < engine.SEEDS else None
 
 
 def init_game_state():
-    st.session_state.roster_a = {slot: None for slot in PITCH_SLOTS}
-    st.session_state.roster_b = {slot: None for slot in PITCH_SLOTS}
-
-    st.session_state.used_teams = set()
-    st.session_state.round_index = 0
-    st.session_state.pick_in_round = 0
-
-    st.session_state.round_team = random.choice(teams_all)
-    st.session_state.used_teams.add(st.session_state.round_team)
-
-    # block drafting the same pitcher from the same team within the round
-    st.session_state.round_used_players = set()
-
+    st.session_state.game = engine.new_game(RULES, index, seed=query_seed())
     st.session_state.message = ""
 
 
-def current_picker() -> str:
-    round_index = st.session_state.round_index
-    first = "A" if (round_index % 2 == 0) else "B"
-    second = "B" if first == "A" else "A"
-    return first if st.session_state.pick_in_round == 0 else second
-
-
-def advance_pick():
-    st.session_state.pick_in_round += 1
-    if st.session_state.pick_in_round >= 2:
-        st.session_state.pick_in_round = 0
-        st.session_state.round_index += 1
-        st.session_state.round_used_players = set()
-
-        remaining = [t for t in teams_all if t not in st.session_state.used_teams]
-        if remaining:
-            st.session_state.round_team = random.choice(remaining)
-            st.session_state.used_teams.add(st.session_state.round_team)
-        else:
-            st.session_state.round_team = None
-
-
-def round_team_df() -> pd.DataFrame:
-    team = st.session_state.round_team
-    if team is None:
-        return df.iloc[0:0].copy()
-    return df[df["team"] == team].copy()
-
-
-def roster_taken_keys(roster: dict) -> set:
-    return {(v["player"], v.get("team")) for v in roster.values() if v is not None}
-
-
-def options_for_slot(team_df: pd.DataFrame, roster: dict) -> pd.DataFrame:
-    taken_keys = roster_taken_keys(roster)
-
-    pool = team_df.copy()
-
-    # remove already drafted (player, team) from this roster
-    if taken_keys:
-        pool = pool[~pool.apply(lambda r: (r["player"], r["team"]) in taken_keys, axis=1)]
-
-    # remove players already taken this round by either team
-    if st.session_state.round_used_players:
-        pool = pool[~pool["player"].isin(st.session_state.round_used_players)]
-
-    # one row per player, best WAR already in your CSV, but we max again just in case
-    best = pool.groupby("player", as_index=False)["war"].max()
-    return best.sort_values("player", key=lambda s: s.str.lower()).reset_index(drop=True)
-
+def apply_pick(team_letter: str, ui_slot: str, widget_key: str):
+    # on_change callback: it runs before the board does, so the board draws
+    # the pick in the same run instead of needing a second st.rerun().
+    player_name = st.session_state[widget_key]
+    game = st.session_state.game
+    if player_name == "—" or engine.pick_at(game, team_letter, ui_slot) is not None:
+        return
 
+    try:
+        pick = engine.apply_move(game, Move(ui_slot, player_name))
+    except IllegalMove as e:
+        st.session_state.message = str(e)
+        return
 
-def apply_pick(team_letter: str, ui_slot: str, player_name: str):
-    roster_key = "roster_a" if team_letter == "A" else "roster_b"
-    roster = st.session_state[roster_key]
+    st.session_state.message = RULES.describe(team_letter, ui_slot, pick)
+    st.session_state[f"roster_{team_letter.lower()}_search"] = ""
 
-    if roster[ui_slot] is not None:
-        return
 
-    team_df = round_team_df()
-    rows = team_df[team_df["player"] == player_name].copy()
-    if rows.empty:
-        st.session_state.message = f"No data found for {player_name}."
+def play_bot_turns(game):
+    # Single-player mode: the computer drafts for Team B whenever it is on the clock.
+    if not st.session_state.get("vs_bot"):
         return
 
-    chosen_war = float(rows["war"].max())
+    messages = [st.session_state.message] if st.session_state.message else []
+    while not engine.is_over(game) and engine.current_picker(game) == BOT_LETTER:
+        move = bot.choose_move(game)
+        if move is None:
+            break
+        pick = engine.apply_move(game, move)
+        messages.append(RULES.describe(BOT_LETTER, move.slot, pick))
+    st.session_state.message = " ".join(messages)
 
-    roster[ui_slot] = {
-        "player": player_name,
-        "war": chosen_war,
-        "team": st.session_state.round_team,
-    }
-    st.session_state[roster_key] = roster
 
-    st.session_state.round_used_players.add(player_name)
+if "game" not in st.session_state:
+    init_game_state()
 
-    st.session_state.message = f"Team {team_letter} drafted {player_name} for {chosen_war:.1f} WAR."
-    advance_pick()
-    st.rerun()
 
+def render_header(game):
+    top_left, top_right = st.columns([3, 1], gap="small")
 
-if "roster_a" not in st.session_state:
-    init_game_state()
+    with top_left:
+        team = game.round_team
 
-top_left, top_right = st.columns([3, 1], gap="small")
-
-with top_left:
-    team = st.session_state.round_team
-
-    if team:
-        logo_path = LOGO_DIR / f"{team}.png"
-        if logo_path.exists():
-            b64 = base64.b64encode(logo_path.read_bytes()).decode()
-            st.markdown(
-                f"""
-                <div style="display:flex; align-items:center; gap:14px;">
-                  <div style="font-size:32px; font-weight:700; white-space:nowrap;">
-                    Selected team:
-                  </div>
-                  <img src="data:image/png;base64,{b64}" style="height:72px; width:auto; display:block;" />
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+        if team:
+            with profiling.phase("logo"):
+                logo = logos.img_tag(team, static=st.get_option("server.enableStaticServing"))
+            if logo:
+                st.markdown(
+                    f"""
+                    <div style="display:flex; align-items:center; gap:14px;">
+                      <div style="font-size:32px; font-weight:700; white-space:nowrap;">
+                        Selected team:
+                      </div>
+                      {logo}
+                    </div>
+                    """,
+                    unsafe_allow_html=True,
+                )
+            else:
+                st.subheader(f"Selected team: {team}")
         else:
-            st.subheader(f"Selected team: {team}")
-    else:
-        st.subheader("Selected team: none")
-
-    st.caption(
-        f"Round: {st.session_state.round_index + 1}   "
-        f"Pick: {st.session_state.pick_in_round + 1} of 2   "
-        f"On the clock: Team {current_picker()}"
-    )
+            st.subheader("Selected team: none")
 
-with top_right:
-    if st.button("reset game"):
-        init_game_state()
-        st.rerun()
+        st.caption(
+            f"Round: {game.round_index + 1}   "
+            f"Pick: {game.pick_in_round + 1} of 2   "
+            f"On the clock: Team {engine.current_picker(game)}"
+        )
+
+    with top_right:
+        st.button("reset game", on_click=init_game_state)
+        st.toggle("vs computer", key="vs_bot")
 
-if st.session_state.message:
-    st.info(st.session_state.message)
+    if st.session_state.message:
+        st.info(st.session_state.message)
 
-team_df = round_team_df()
-on_clock = current_picker()
 
-colA, colB = st.columns(2, gap="medium")
+def picked_pill(pick) -> str:
+    return (
+        f'<div class="picked-pill" style="background:{team_color(pick.team)};">'
+        f"{pick.player} <small>• {float(pick.war):.1f} WAR</small></div>"
+    )
 
 
 def slot_label(slot: str) -> str:
-    return slot.upper()
+    return RULES.slot_label(slot)
 
 
-def render_team(letter: str, roster_key: str):
-    roster = st.session_state[roster_key]
-    total = roster_total(roster)
+@profiling.timed("render_team")
+def render_team(game, letter: str, on_clock: str, live):
+    roster_key = f"roster_{letter.lower()}"
+    roster = engine.roster(game, letter)
+    total = engine.roster_total(roster)
     st.subheader(f"TEAM {letter}  •  Total WAR: {total:.1f}")
+    if live is not None:
+        render_live(live)
+
+    is_active = (letter == on_clock) and (game.round_team is not None)
+
+    if not is_active:
+        # Nothing to pick: one static block, no widgets.
+        rows = []
+        for ui_slot in PITCH_SLOTS:
+            cell = picked_pill(roster[ui_slot]) if roster[ui_slot] else '<div class="open-slot">—</div>'
+            rows.append(f'<div class="board-row"><b>{slot_label(ui_slot)}</b>{cell}</div>')
+        st.markdown("".join(rows), unsafe_allow_html=True)
+        return
 
-    is_active = (letter == on_clock) and (st.session_state.round_team is not None)
+    # Names are matched on the server and each list carries at most
+    # search.TOP_K of them, instead of every player for every open slot.
+    query = st.text_input(
+        "Search players",
+        key=f"{roster_key}_search",
+        placeholder="Search players (press Enter)",
+        label_visibility="collapsed",
+    )
+    st.caption(f"Each list shows up to {search.TOP_K} names; search to find the rest.")
 
     for ui_slot in PITCH_SLOTS:
         left, right = st.columns([1, 9], gap="small")
@@ -341,55 +318,91 @@ def render_team(letter: str, roster_key: str):
         current = roster[ui_slot]
         with right:
             if current is None:
-                if not is_active:
+                opts = engine.search(game, ui_slot, query, letter=letter)
+                if not opts:
+                    st.caption("No matches for this slot." if query else "No options for this slot on this team.")
+                else:
+                    names = [p for p, _ in opts]
+                    key = f"{roster_key}_{ui_slot}_pick"
                     st.selectbox(
                         "Pick",
-                        options=["—"],
-                        key=f"{roster_key}_{ui_slot}_inactive",
+                        options=["—"] + names,
+                        key=key,
                         label_visibility="collapsed",
-                        disabled=True,
+                        on_change=apply_pick,
+                        args=(letter, ui_slot, key),
                     )
-                else:
-                    opts = options_for_slot(team_df, roster)
-                    if opts.empty:
-                        st.caption("No options for this slot on this team.")
-                    else:
-                        names = opts["player"].tolist()
-                        choice = st.selectbox(
-                            "Pick",
-                            options=["—"] + names,
-                            key=f"{roster_key}_{ui_slot}_pick",
-                            label_visibility="collapsed",
-                        )
-                        if choice != "—":
-                            apply_pick(letter, ui_slot, choice)
             else:
-                war_val = float(current["war"])
-                picked_team = current.get("team", "")
-                bg = team_color(picked_team)
-                st.markdown(
-                    f"""
-                    <div class="picked-pill" style="background:{bg};">
-                      {current["player"]} <small>• {war_val:.1f} WAR</small>
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
+                st.markdown(picked_pill(current), unsafe_allow_html=True)
+
 
+@profiling.timed("analytics")
+def live_stats(game) -> dict:
+    return analytics.live(game)
 
-with colA:
-    render_team("A", "roster_a")
-with colB:
-    render_team("B", "roster_b")
 
-done_a = all(st.session_state.roster_a[s] is not None for s in PITCH_SLOTS)
-done_b = all(st.session_state.roster_b[s] is not None for s in PITCH_SLOTS)
+def render_live(live):
+    # Win chance and ceiling always; the per-slot WAR on offer gives picks
+    # away, so it stays folded until asked for.
+    st.caption(f"Win chance: {live.win:.0%}   Ceiling: {live.ceiling:.1f} WAR")
+    offered = {s: w for s, w in live.upside.items() if w is not None}
+    if offered:
+        with st.expander("Best WAR left this round"):
+            st.markdown("  •  ".join(f"**{slot_label(s)}** {w:.1f}" for s, w in offered.items()))
 
-if done_a and done_b:
+
+def render_result(game):
     st.divider()
-    total_a = roster_total(st.session_state.roster_a)
-    total_b = roster_total(st.session_state.roster_b)
+    total_a = engine.roster_total(engine.roster(game, "A"))
+    total_b = engine.roster_total(engine.roster(game, "B"))
     winner = "TEAM A" if total_a > total_b else ("TEAM B" if total_b > total_a else "TIE")
     st.header(f"Winner: {winner}")
     st.subheader(f"Team A total WAR: {total_a:.1f}")
     st.subheader(f"Team B total WAR: {total_b:.1f}")
+
+    # Both rosters draft from the same round teams, so they share one perfect score.
+    table = solver.slot_table(RULES, game.index)
+    perfect, _ = solver.perfect_draft(table, [v.team for v in engine.roster(game, "A").values()])
+    st.caption(f"Perfect draft with these teams: {perfect:.1f} WAR")
+    if game.seed is not None:
+        st.caption(f"Add ?seed={game.seed} to the URL to replay these teams.")
+
+    best = history.leaderboard(RULES.name)
+    if best:
+        with st.expander("Best drafts so far"):
+            st.markdown("\n".join(f"{i}. {total:.1f} WAR" for i, (total, *_) in enumerate(best, 1)))
+
+
+# ----------------------------
+# Draft board
+# ----------------------------
+# A pick moves the clock, can bring up a new round team and changes both
+# columns, so header, columns and result all redraw together. Keeping them
+# in one fragment means picks, reset and the bot toggle rerun only this
+# part, not the CSS, title, rules and data load above.
+@st.fragment
+def draft_board():
+    with profiling.fragment_run(st, "draft_board"):
+        game = st.session_state.game
+        prefetch.upcoming(game, with_bot=bool(st.session_state.get("vs_bot")))
+        play_bot_turns(game)
+        render_header(game)
+        live = None if engine.is_over(game) else live_stats(game)
+
+        on_clock = engine.current_picker(game)
+        colA, colB = st.columns(2, gap="medium")
+        with colA:
+            render_team(game, "A", on_clock, live and live["A"])
+        with colB:
+            render_team(game, "B", on_clock, live and live["B"])
+
+        if engine.is_over(game):
+            if st.session_state.get("recorded") is not game:
+                history.record(game, BOT_LETTER if st.session_state.get("vs_bot") else None)
+                st.session_state.recorded = game
+            render_result(game)
+
+
+draft_board()
+
+profiling.end_rerun(st)
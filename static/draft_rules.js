@@ -0,0 +1,220 @@
+// Draft rules for the static build, a port of war_draft.engine and
+// war_draft.availability. `python -m war_draft.export` replays a random
+// game corpus through this file under node and fails if any option list,
+// pick, error message or total differs from the Python engine.
+//
+// A game needs the mode manifest and, per round team, that team's shard:
+//   players: [name, ...]
+//   seasons: [[war, data slot index, war, data slot index, ...], ...]  best first
+//   slots:   [[player index, ...] per data slot]  display order
+//   util:    [player index, ...]  (hitters) best season first
+(function (root) {
+  "use strict";
+
+  const LETTERS = ["A", "B"];
+
+  class IllegalMove extends Error {}
+
+  class TeamPool {
+    constructor(manifest, shard) {
+      this.players = shard.players;
+      this.dataSlots = manifest.data_slots;
+      // player -> [[war, data slot], ...] best first
+      this.seasons = new Map();
+      shard.players.forEach((p, i) => {
+        const flat = shard.seasons[i];
+        const list = [];
+        for (let j = 0; j < flat.length; j += 2) list.push([flat[j], this.dataSlots[flat[j + 1]]]);
+        this.seasons.set(p, list);
+      });
+      this.slotPlayers = {};
+      this.dataSlots.forEach((s, i) => {
+        this.slotPlayers[s] = (shard.slots[i] || []).map((pid) => [this.players[pid], this.bestWar(this.players[pid], s)]);
+      });
+      this.utilOrder = (shard.util || []).map((pid) => [this.players[pid], this.seasons.get(this.players[pid])[0][0]]);
+    }
+
+    playersAt(dataSlot) {
+      return this.slotPlayers[dataSlot] || [];
+    }
+
+    bestWar(player, dataSlot) {
+      for (const [w, s] of this.seasons.get(player) || []) if (s === dataSlot) return w;
+      return null;
+    }
+  }
+
+  // Python's f"{war:.1f}". toFixed rounds exact ties (x.25, x.75) up where
+  // Python rounds them to even.
+  function fmt1(x) {
+    const a = Math.abs(x);
+    if (Number.isInteger(a * 4) && (a * 4) % 2 === 1) {
+      let n = Math.floor(a * 10);
+      if (n % 2 === 1) n += 1;
+      return (x < 0 ? "-" : "") + (n / 10).toFixed(1);
+    }
+    return x.toFixed(1);
+  }
+
+  // Python orders UTIL entries by (-war, player); strings compare by code point.
+  function utilBefore(a, b) {
+    if (a[1] !== b[1]) return a[1] > b[1];
+    return a[0] < b[0];
+  }
+
+  class Draft {
+    constructor(manifest, order) {
+      this.manifest = manifest;
+      this.slots = manifest.slots;
+      this.utilSlot = manifest.util_slot;
+      this.order = order;
+      this.pools = new Map();
+      this.rosters = {};
+      for (const l of LETTERS) this.rosters[l] = Object.fromEntries(this.slots.map((s) => [s, null]));
+      this.roundIndex = 0;
+      this.pickInRound = 0;
+    }
+
+    addShard(team, shard) {
+      if (!this.pools.has(team)) this.pools.set(team, new TeamPool(this.manifest, shard));
+    }
+
+    get roundTeam() {
+      return this.roundIndex < this.order.length ? this.order[this.roundIndex] : null;
+    }
+
+    roundPool() {
+      const team = this.roundTeam;
+      if (team === null) return null;
+      const pool = this.pools.get(team);
+      if (!pool) throw new Error(`No shard loaded for ${team}.`);
+      return pool;
+    }
+
+    currentPicker() {
+      const order = this.roundIndex % 2 === 0 ? LETTERS : [...LETTERS].reverse();
+      return order[this.pickInRound];
+    }
+
+    isOver() {
+      return LETTERS.every((l) => this.slots.every((s) => this.rosters[l][s] !== null));
+    }
+
+    slotLabel(slot) {
+      return this.manifest.labels[this.slots.indexOf(slot)];
+    }
+
+    dataSlot(slot) {
+      return this.manifest.slot_data[this.slots.indexOf(slot)];
+    }
+
+    // What the round in progress blocks: the picks made from the round team.
+    avail() {
+      const team = this.roundTeam;
+      const taken = Object.fromEntries(LETTERS.map((l) => [l, new Set()]));
+      const usedAt = new Map();
+      const usedBy = new Map();
+      for (const l of LETTERS) {
+        for (const s of this.slots) {
+          const pick = this.rosters[l][s];
+          if (pick === null || pick.team !== team) continue;
+          if (!usedAt.has(pick.source_slot)) usedAt.set(pick.source_slot, new Set());
+          usedAt.get(pick.source_slot).add(pick.player);
+          if (!usedBy.has(pick.player)) usedBy.set(pick.player, new Set());
+          usedBy.get(pick.player).add(pick.source_slot);
+          taken[l].add(pick.player);
+        }
+      }
+      return { taken, usedAt, usedBy };
+    }
+
+    // [[player, war], ...] for slot, in the order the apps list them
+    options(slot, letter) {
+      const pool = this.roundTeam === null ? null : this.roundPool();
+      if (pool === null) return [];
+      letter = letter || this.currentPicker();
+      const { taken, usedAt, usedBy } = this.avail();
+      if (slot === this.utilSlot) {
+        const mine = taken[letter];
+        const order = pool.utilOrder.filter(([p]) => !usedBy.has(p) && !mine.has(p));
+        for (const [player, usedSlots] of usedBy) {
+          if (mine.has(player)) continue;
+          const season = pool.seasons.get(player).find(([, s]) => !usedSlots.has(s));
+          if (!season) continue;
+          const entry = [player, season[0]];
+          let i = order.findIndex((e) => utilBefore(entry, e));
+          if (i < 0) i = order.length;
+          order.splice(i, 0, entry);
+        }
+        return order;
+      }
+      const ds = this.dataSlot(slot);
+      const used = usedAt.get(ds) || new Set();
+      return pool.playersAt(ds).filter(([p]) => !used.has(p) && !taken[letter].has(p));
+    }
+
+    resolve(pool, usedBy, slot, player) {
+      const usedSlots = usedBy.get(player) || new Set();
+      if (this.manifest.mode === "pitchers") {
+        if (usedSlots.has("p")) throw new IllegalMove(`${player} is already taken this round.`);
+        const war = pool.bestWar(player, "p");
+        if (war === null) throw new IllegalMove(`No data found for ${player}.`);
+        return [war, "p"];
+      }
+      if (slot === this.utilSlot) {
+        const season = (pool.seasons.get(player) || []).find(([, s]) => !usedSlots.has(s));
+        if (!season) throw new IllegalMove(`No remaining season available for ${player} in UTIL.`);
+        return season;
+      }
+      const ds = this.dataSlot(slot);
+      if (usedSlots.has(ds)) throw new IllegalMove(`${player} at ${ds.toUpperCase()} is already taken this round.`);
+      const war = pool.bestWar(player, ds);
+      if (war === null) throw new IllegalMove(`No data found for ${player} at ${ds.toUpperCase()}.`);
+      return [war, ds];
+    }
+
+    apply(slot, player) {
+      const letter = this.currentPicker();
+      if (this.roundTeam === null) throw new IllegalMove("The draft is over.");
+      const pool = this.roundPool();
+      if (!this.slots.includes(slot)) throw new IllegalMove(`Unknown slot ${slot}.`);
+      if (this.rosters[letter][slot] !== null) {
+        throw new IllegalMove(`Team ${letter} already filled ${this.slotLabel(slot)}.`);
+      }
+      const { taken, usedBy } = this.avail();
+      if (taken[letter].has(player)) throw new IllegalMove(`Team ${letter} already drafted ${player} from this team.`);
+
+      const [war, sourceSlot] = this.resolve(pool, usedBy, slot, player);
+      const pick = { player, war, source_slot: sourceSlot, team: this.roundTeam };
+      this.rosters[letter][slot] = pick;
+      this.pickInRound += 1;
+      if (this.pickInRound >= 2) {
+        this.pickInRound = 0;
+        this.roundIndex += 1;
+      }
+      return pick;
+    }
+
+    describe(letter, slot, pick) {
+      if (this.manifest.mode === "pitchers") return `Team ${letter} drafted ${pick.player} for ${fmt1(pick.war)} WAR.`;
+      if (slot === this.utilSlot) return `Team ${letter} drafted ${pick.player} in UTIL for ${fmt1(pick.war)} WAR.`;
+      return `Team ${letter} drafted ${pick.player} at ${pick.source_slot.toUpperCase()} for ${fmt1(pick.war)} WAR.`;
+    }
+
+    total(letter) {
+      let total = 0;
+      for (const s of this.slots) if (this.rosters[letter][s] !== null) total += this.rosters[letter][s].war;
+      return total;
+    }
+
+    winner() {
+      const a = this.total("A");
+      const b = this.total("B");
+      return a > b ? "A" : b > a ? "B" : "TIE";
+    }
+  }
+
+  const DraftRules = { LETTERS, IllegalMove, Draft, fmt1 };
+  if (typeof module !== "undefined" && module.exports) module.exports = DraftRules;
+  else root.DraftRules = DraftRules;
+})(this);
@@ -0,0 +1,81 @@
+import json
+import random
+
+import pytest
+
+from war_draft import api
+
+
+@pytest.fixture(scope="module")
+def draft_api():
+    return api.DraftAPI()
+
+
+def call(draft_api, method, target, body=None):
+    raw = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+    return draft_api.respond(method, target, raw)
+
+
+def new_game(draft_api, **body):
+    status, data = call(draft_api, "POST", "/games", {"mode": "pitchers", "seed": 1, **body})
+    assert status == 201
+    return data
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"mode": [1]},
+        {"mode": {}},
+        {"mode": "curling"},
+        {"seed": "1"},
+        {"seed": 10**20},
+        {"seed": -1},
+        {"drafters": 2.0},
+        {"drafters": 13},
+        b"not json",
+        b"[1, 2]",
+    ],
+)
+def test_create_rejects_malformed_bodies(draft_api, body):
+    status, data = call(draft_api, "POST", "/games", body)
+    assert status == 400
+    assert data["error"]
+
+
+def test_bad_slot_and_roster(draft_api):
+    gid = new_game(draft_api)["id"]
+    assert call(draft_api, "GET", f"/games/{gid}/options?slot=c")[0] == 400
+    assert call(draft_api, "GET", f"/games/{gid}/options?slot=p1&roster=Z")[0] == 400
+    assert call(draft_api, "POST", f"/games/{gid}/picks", {"slot": "c", "player": "Nobody"})[0] == 409
+    assert call(draft_api, "POST", f"/games/{gid}/picks", {"slot": ["p1"], "player": 5})[0] == 400
+    assert call(draft_api, "POST", f"/games/{gid}/picks", {"pass": True})[0] == 409
+    assert call(draft_api, "GET", f"/games/{gid}/result")[0] == 409
+    assert call(draft_api, "GET", "/games/nope")[0] == 404
+
+
+def test_pick_after_the_game_is_over(draft_api):
+    state = new_game(draft_api)
+    gid = state["id"]
+    rng = random.Random(1)
+    while not state["over"]:
+        slot = next(s for s in state["slots"] if state["rosters"][state["on_clock"]][s] is None)
+        _, opts = call(draft_api, "GET", f"/games/{gid}/options?slot={slot}")
+        move = {"slot": slot, "player": rng.choice(opts["players"])}
+        status, data = call(draft_api, "POST", f"/games/{gid}/picks", move)
+        assert status == 200
+        state = data["state"]
+
+    status, data = call(draft_api, "POST", f"/games/{gid}/picks", {"slot": "p1", "player": "Nolan Ryan"})
+    assert status == 409
+    assert call(draft_api, "GET", f"/games/{gid}/result")[0] == 200
+
+
+def test_unexpected_errors_answer_500(draft_api, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(draft_api, "create", broken)
+    status, data = call(draft_api, "POST", "/games", {})
+    assert status == 500
+    assert data == {"error": "Internal server error."}
@@ -0,0 +1,82 @@
+import random
+import sqlite3
+
+from war_draft import engine, history
+from war_draft.data import load_pitch_pool
+from war_draft.index import pitch_index
+
+
+def short_pool(tmp_path):
+    # Seven teams of four pitchers, except one with two: in a four-drafter
+    # league the last two drafters of that round have nothing left.
+    lines = ["team,player,war"]
+    for t in range(7):
+        for p in range(2 if t == 0 else 4):
+            lines.append(f"team{t},Pitcher {t}-{p},{p + 1}.5")
+    path = tmp_path / "pitch_game_pool.csv"
+    path.write_text("\n".join(lines) + "\n")
+    return pitch_index(load_pitch_pool(path, use_build=False))
+
+
+def play(state, rng):
+    passes = 0
+    while not engine.is_over(state):
+        moves = engine.legal_moves(state)
+        if moves:
+            engine.apply_move(state, rng.choice(moves))
+        else:
+            engine.pass_pick(state)
+            passes += 1
+    return passes
+
+
+def test_league_game_with_passes_round_trips(tmp_path):
+    index = short_pool(tmp_path)
+    state = engine.new_game(engine.PITCHERS, index, seed=3, drafters=4)
+    assert play(state, random.Random(3)) == 2
+
+    conn = history.connect(str(tmp_path / "history.sqlite3"))
+    history.insert(conn, [history.snapshot(state)])
+    (game_id,) = conn.execute("SELECT id FROM games").fetchone()
+    assert sum(m is None for m in history.moves(conn, game_id)) == 2
+
+    replayed = history.replay(conn, game_id, engine.PITCHERS, index)
+    assert replayed.letters == state.letters
+    assert replayed.picks == state.picks
+    assert replayed.filled == state.filled
+    assert engine.winner(replayed) == engine.winner(state)
+
+
+def test_connect_migrates_older_files(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    old = sqlite3.connect(path)
+    old.executescript(
+        "CREATE TABLE games (id INTEGER PRIMARY KEY, mode TEXT NOT NULL, seed INTEGER, teams TEXT NOT NULL,"
+        " bot TEXT, winner TEXT NOT NULL, finished_at REAL NOT NULL);"
+        "CREATE TABLE picks (game_id INTEGER NOT NULL, seq INTEGER NOT NULL, mode TEXT NOT NULL,"
+        " roster TEXT NOT NULL, slot TEXT NOT NULL, team TEXT NOT NULL, player TEXT NOT NULL,"
+        " war REAL NOT NULL, PRIMARY KEY (game_id, seq)) WITHOUT ROWID;"
+        "INSERT INTO games VALUES (1, 'pitchers', 1, 'a,b', NULL, 'A', 0);"
+    )
+    old.close()
+
+    conn = history.connect(path)
+    assert conn.execute("SELECT drafters FROM games WHERE id = 1").fetchone() == (2,)
+    assert "passed" in {row[1] for row in conn.execute("PRAGMA table_info(picks)")}
+
+
+def test_writer_survives_a_batch_that_cannot_be_stored(tmp_path):
+    index = short_pool(tmp_path)
+    games = []
+    for seed in (1, 2):
+        state = engine.new_game(engine.PITCHERS, index, seed=seed, drafters=4)
+        play(state, random.Random(seed))
+        games.append(state)
+    games[0].seed = 10**20  # too big for an SQLite INTEGER
+
+    w = history.Writer(str(tmp_path / "history.sqlite3"))
+    w.submit(history.snapshot(games[0]))
+    assert w.flush(10)
+    w.submit(history.snapshot(games[1]))
+    assert w.flush(10)
+    assert (w.written, w.failed) == (1, 1)
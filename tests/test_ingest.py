@@ -0,0 +1,113 @@
+import csv
+
+from war_draft import ingest
+from war_draft.data import load_hitter_pool
+
+BATTING = [
+    ("season", "team", "player", "war"),
+    (2001, "Red Sox", "Catcher One", 2.0),
+    (2001, "Red Sox", "Utility Guy", 1.0),
+    (2001, "red sox", "Utility Guy", 0.5),  # second stint, same team
+    (2001, "Cubs", "Slugger", 4.0),
+    (2002, "Cubs", "Slugger", 5.5),
+]
+FIELDING = [
+    ("season", "team", "player", "pos", "games"),
+    (2001, "Red Sox", "Catcher One", "C", 120),
+    (2001, "Red Sox", "Utility Guy", "2B", 60),
+    (2001, "Red Sox", "Utility Guy", "SS", 25),
+    (2001, "Red Sox", "Utility Guy", "LF", 5),
+    (2001, "Cubs", "Slugger", "RF", 150),
+    (2002, "Cubs", "Slugger", "DH", 140),
+]
+PITCHING = [
+    ("season", "team", "player", "war"),
+    (2001, "Cubs", "Ace", 6.0),
+    (2002, "Cubs", "Ace", 3.0),
+]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def run(tmp_path):
+    # A fresh Ingest each time, as the CLI does, so stats are per run.
+    job = ingest.Ingest(tmp_path / "raw", tmp_path / "work", chunk_rows=2)
+    written = job.run(tmp_path / "out")
+    return {mode: changed for mode, (_, changed) in written.items()}, job.stats
+
+
+def raw_dir(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    write_csv(raw / "batting.csv", BATTING)
+    write_csv(raw / "fielding.csv", FIELDING)
+    write_csv(raw / "pitching.csv", PITCHING)
+    return raw
+
+
+def test_first_run_builds_both_pools(tmp_path):
+    raw_dir(tmp_path)
+    written, stats = run(tmp_path)
+    assert written == {"hitters": True, "pitchers": True}
+    assert stats["files_read"] == 3
+    assert stats["partitions_built"] == 3 + 2  # hitters: 2 Cubs seasons + 1 Red Sox; pitchers: 2
+
+    # Stints add up, LF's 5 games fall short of MIN_GAMES, and the 2002 DH
+    # season does not lift Slugger's OF row.
+    assert read_csv(tmp_path / "out" / "game_pool.csv") == [
+        ["team", "slot", "player", "war"],
+        ["cubs", "of", "Slugger", "4.0"],
+        ["cubs", "dh", "Slugger", "5.5"],
+        ["red_sox", "c", "Catcher One", "2.0"],
+        ["red_sox", "2b", "Utility Guy", "1.5"],
+        ["red_sox", "ss", "Utility Guy", "1.5"],
+    ]
+    assert read_csv(tmp_path / "out" / "pitch_game_pool.csv") == [["team", "player", "war"], ["cubs", "Ace", "6.0"]]
+    assert len(load_hitter_pool(tmp_path / "out" / "game_pool.csv", use_build=False).teams) == 2
+
+
+def test_unchanged_rerun_is_a_no_op(tmp_path):
+    raw_dir(tmp_path)
+    run(tmp_path)
+    before = {p: p.stat().st_mtime_ns for p in (tmp_path / "out").iterdir()}
+
+    written, stats = run(tmp_path)
+    assert written == {"hitters": False, "pitchers": False}
+    assert stats["files_read"] == 0 and stats["files_kept"] == 3
+    assert stats["partitions_built"] == 0 and stats["teams_merged"] == 0
+    assert {p: p.stat().st_mtime_ns for p in (tmp_path / "out").iterdir()} == before
+
+
+def test_changed_input_rebuilds_only_what_it_touches(tmp_path):
+    raw = raw_dir(tmp_path)
+    run(tmp_path)
+    hitters_before = read_csv(tmp_path / "out" / "game_pool.csv")
+
+    # A new pitching season for one team: only that file and partition move.
+    write_csv(raw / "pitching.csv", PITCHING + [(2003, "Red Sox", "Closer", 2.5)])
+    written, stats = run(tmp_path)
+    assert written == {"hitters": False, "pitchers": True}
+    assert stats["files_read"] == 1 and stats["files_kept"] == 2
+    assert stats["partitions_built"] == 1
+    assert stats["teams_merged"] == 1 and stats["teams_kept"] == 3
+    assert read_csv(tmp_path / "out" / "game_pool.csv") == hitters_before
+    assert read_csv(tmp_path / "out" / "pitch_game_pool.csv") == [
+        ["team", "player", "war"],
+        ["cubs", "Ace", "6.0"],
+        ["red_sox", "Closer", "2.5"],
+    ]
+
+    # A removed file takes its rows out of the pool.
+    (raw / "pitching.csv").unlink()
+    write_csv(raw / "pitching_2001.csv", PITCHING[:2])
+    written, stats = run(tmp_path)
+    assert written["pitchers"] and stats["files_dropped"] == 1
+    assert read_csv(tmp_path / "out" / "pitch_game_pool.csv") == [["team", "player", "war"], ["cubs", "Ace", "6.0"]]
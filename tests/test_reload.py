@@ -0,0 +1,58 @@
+import gc
+import os
+import random
+import weakref
+
+from war_draft import analytics, bot, engine, prefetch, reload, solver
+from war_draft.data import HITTER_POOL_CSV, load_hitter_pool
+
+
+def play(state, rng):
+    # Random legal picks to the end, passing when nothing is left.
+    while not engine.is_over(state):
+        moves = engine.legal_moves(state)
+        if moves:
+            engine.apply_move(state, rng.choice(moves))
+        else:
+            engine.pass_pick(state)
+
+
+def edit(path, n):
+    # Change one WAR value and move the mtime on, as an editor save would.
+    lines = path.read_text().splitlines(keepends=True)
+    team, slot, player, _ = lines[1].rstrip("\n").split(",")
+    lines[1] = f"{team},{slot},{player},{n}.5\n"
+    path.write_text("".join(lines))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9 * (n + 1)))
+
+
+def test_reloads_keep_at_most_two_indexes_alive(tmp_path):
+    path = tmp_path / "game_pool.csv"
+    path.write_bytes(HITTER_POOL_CSV.read_bytes())
+    p = reload.Provider("hitters", path, interval=0)
+    p._load_pool = lambda path: load_hitter_pool(path, use_build=False)
+
+    rng = random.Random(7)
+    seen = []
+    for n in range(6):
+        index = p.index()
+        seen.append(weakref.ref(index))
+        game = engine.new_game(p.rules, index, seed=n)
+        # Fill every per-index cache the apps and the API touch.
+        for future in prefetch.upcoming(game, with_bot=True):
+            future.result()
+        analytics.live(game)
+        bot.expected_best(game)
+        play(game, rng)
+        solver.perfect_draft(solver.slot_table(game.rules, game.index), [index.teams[t] for t in game.order])
+        del game, index
+
+        edit(path, n)
+        assert not p.check()  # a change has to hold still for one poll
+        assert p.check()
+
+    gc.collect()
+    alive = sum(ref() is not None for ref in seen)
+    assert p.stats["reloads"] == 6
+    assert alive <= 2
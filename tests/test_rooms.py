@@ -0,0 +1,88 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from war_draft import engine, rooms
+
+
+@pytest.fixture(scope="module")
+def hub():
+    return rooms.Hub()
+
+
+class FakeSocket:
+    # Feeds hub.handle a fixed list of frames and keeps what it sends back.
+    def __init__(self, frames):
+        self.frames = [f if isinstance(f, str) else json.dumps(f) for f in frames]
+        self.sent = []
+
+    def __aiter__(self):
+        return self._frames()
+
+    async def _frames(self):
+        for f in self.frames:
+            yield f
+
+    async def send(self, data):
+        self.sent.append(json.loads(data))
+
+    async def close(self, *args):
+        pass
+
+
+def run(hub, frames) -> list:
+    ws = FakeSocket(frames)
+    asyncio.run(hub.handle(ws))
+    return ws.sent
+
+
+@pytest.mark.parametrize("mode", [[1], {}, None, "curling"])
+def test_create_rejects_bad_modes(hub, mode):
+    with pytest.raises(rooms.RoomError):
+        hub.create(mode)
+
+
+@pytest.mark.parametrize("seed", ["1", 1.5, -1, 10**20])
+def test_create_rejects_bad_seeds(hub, seed):
+    with pytest.raises(rooms.RoomError):
+        hub.create("pitchers", seed)
+
+
+def test_malformed_frames_get_errors_and_keep_the_socket(hub, monkeypatch):
+    # websockets.broadcast needs real connections; state pushes are not under test here.
+    monkeypatch.setattr(rooms, "broadcast", lambda connections, message: None)
+    sent = run(
+        hub,
+        [
+            "not json",
+            [1, 2],
+            {"type": "options", "slot": "p1"},
+            {"type": "create", "mode": [1]},
+            {"type": "create", "mode": "pitchers", "seed": 1},
+            {"type": "options", "slot": "c"},
+            {"type": "options", "slot": "p1", "q": 5},
+            {"type": "pick", "slot": "p1"},
+            {"type": "pick", "slot": "p1", "player": "Nobody"},
+            {"type": "bogus"},
+            {"type": "options", "slot": "p1", "q": "ryan"},
+        ],
+    )
+    kinds = [m["type"] for m in sent]
+    assert kinds == ["error"] * 4 + ["joined"] + ["error"] * 5 + ["options"]
+
+
+def test_pick_out_of_turn_and_after_the_game(hub, monkeypatch):
+    monkeypatch.setattr(rooms, "broadcast", lambda connections, message: None)
+    room = hub.create("pitchers", 2)
+    game = room.game
+    with pytest.raises(rooms.RoomError):
+        hub.pick(room, "B", {"slot": "p1", "player": engine.options(game, "p1", "A")[0][0]})
+
+    rng = random.Random(2)
+    while not engine.is_over(game):
+        move = rng.choice(engine.legal_moves(game))
+        hub.pick(room, engine.current_picker(game), {"slot": move.slot, "player": move.player})
+    with pytest.raises(rooms.RoomError):
+        hub.pick(room, "A", {"slot": "p1", "player": "Nolan Ryan"})
@@ -0,0 +1,53 @@
+import pytest
+
+from war_draft.search import NameIndex, fold
+
+NAMES = (
+    "Ken Griffey",
+    "Ken Griffey Jr.",
+    "Iván Rodríguez",
+    "Álex Rodríguez",
+    "A.J. Cole",
+    "Kenny Lofton",
+    "Jay Buhner",
+)
+
+
+@pytest.mark.parametrize(
+    "text, folded",
+    [
+        ("Álex Rodríguez", "alex rodriguez"),
+        ("IVÁN  RODRÍGUEZ", "ivan rodriguez"),
+        ("A.J. Cole", "aj cole"),
+        ("Jean-Pierre Roy", "jean pierre roy"),
+        ("  ", ""),
+    ],
+)
+def test_fold_drops_accents_case_and_punctuation(text, folded):
+    assert fold(text) == folded
+
+
+def test_accent_and_case_insensitive_matches():
+    index = NameIndex(NAMES)
+    assert index.rank("rodriguez") == ["Álex Rodríguez", "Iván Rodríguez"]
+    assert index.rank("IVAN")[0] == "Iván Rodríguez"
+    assert index.rank("álex rod") == ["Álex Rodríguez"]
+    assert index.rank("aj")[0] == "A.J. Cole"
+
+
+def test_prefix_ranking():
+    index = NameIndex(NAMES)
+    # Whole-name prefixes first, then word prefixes, alphabetical within each.
+    assert index.rank("ken")[:3] == ["Ken Griffey", "Ken Griffey Jr.", "Kenny Lofton"]
+    assert index.rank("griff") == ["Ken Griffey", "Ken Griffey Jr."]
+    assert index.rank("ken gr") == ["Ken Griffey", "Ken Griffey Jr."]
+    # A substring, then a typo.
+    assert index.rank("uhne") == ["Jay Buhner"]
+    assert index.rank("grifey")[0] == "Ken Griffey"
+
+
+def test_allowed_and_k():
+    index = NameIndex(NAMES)
+    assert index.rank("ken", allowed={"Kenny Lofton"}) == ["Kenny Lofton"]
+    assert index.rank("ken", k=1) == ["Ken Griffey"]
+    assert index.rank("", k=2) == list(NAMES[:2])
@@ -0,0 +1,48 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from war_draft import engine, solver
+from war_draft.data import load_hitter_pool, load_pitch_pool
+from war_draft.index import hitter_index, pitch_index
+
+MODES = {
+    "hitters": lambda: (engine.HITTERS, hitter_index(load_hitter_pool(use_build=False))),
+    "pitchers": lambda: (engine.PITCHERS, pitch_index(load_pitch_pool(use_build=False))),
+}
+
+
+def brute_force(weights: np.ndarray) -> float:
+    # Best total over every assignment of rounds to slots.
+    n = weights.shape[0]
+    perms = np.array(list(itertools.permutations(range(n))))
+    return float(weights[np.arange(n), perms].sum(axis=1).max())
+
+
+def test_hungarian_matches_brute_force_on_small_matrices():
+    rng = np.random.default_rng(8)
+    for n, m in [(1, 1), (3, 3), (4, 6), (6, 6), (5, 7)]:
+        for _ in range(20):
+            cost = rng.integers(-10, 10, (n, m)).astype(float)
+            cols = solver.hungarian(cost.tolist())
+            assert len(set(cols)) == n
+            best = min(cost[np.arange(n), list(p)].sum() for p in itertools.permutations(range(m), n))
+            assert cost[np.arange(n), cols].sum() == best
+
+
+@pytest.mark.parametrize("mode", sorted(MODES))
+def test_perfect_draft_and_batch_match_brute_force(mode):
+    rules, index = MODES[mode]()
+    table = solver.slot_table(rules, index)
+    rng = random.Random(8)
+    sequences = [rng.sample(index.teams, len(rules.slots)) for _ in range(3)]
+
+    batch = solver.perfect_totals(table, sequences)
+    for seq, total in zip(sequences, batch):
+        expected = brute_force(table.weights(seq))
+        perfect, picks = solver.perfect_draft(table, seq)
+        assert perfect == pytest.approx(expected)
+        assert total == pytest.approx(expected)
+        assert sum(war for _, _, war, _ in picks.values()) == pytest.approx(expected)
@@ -0,0 +1,142 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from war_draft import engine, solver
+
+# Live numbers for each roster during a draft:
+#   upside:  empty ui_slot -> best WAR still on offer there from the round
+#            team, or None when the roster already picked this round
+#   ceiling: the roster's total if its empty slots were filled as well as
+#            possible: this round's upside plus the best unused teams, one
+#            per remaining round (solver.hungarian over the team maxima)
+#   win:     share of SAMPLES simulated finishes the roster wins, ties split
+#
+# Everything reads the per-team, per-column maxima in solver.slot_table,
+# which is built once per index. The simulation draws the rounds still to
+# come from the unused teams (the real order stays hidden) and lets every
+# roster fill its best open slot each round. It is vectorized over samples
+# and cached on what it depends on, so a rerun without a pick reuses it and
+# a pick costs one small batch, late rounds included.
+
+SAMPLES = 256
+# Players guess names, not WAR: a simulated pick gets a uniform share of the
+# best WAR on offer, from SHARE to all of it.
+SHARE = 0.5
+
+
+class LiveStats(NamedTuple):
+    upside: dict
+    ceiling: float
+    win: float
+
+
+def upside(state, letter: str) -> dict:
+    picked = round_picked(state)
+    out = {}
+    for slot in engine.empty_slots(state, letter):
+        opts = () if letter in picked else engine.options(state, slot, letter)
+        out[slot] = max((w for _, w in opts), default=None)
+    return out
+
+
+def round_picked(state) -> set:
+    # letters that already made their pick in the round in progress
+    return set(engine.round_order(state.round_index, state.letters)[: state.pick_in_round])
+
+
+def unused_teams(state, table) -> tuple:
+    # table rows of the teams that can still come up in a later round
+    used = state.used_teams
+    return tuple(table.team_pos[t] for t in state.teams if not used >> state.index.team_id(t) & 1)
+
+
+def ceiling(table, total: float, slots: tuple, now: tuple, unused: tuple) -> float:
+    # slots: empty slot indexes; now: this round's WAR per empty slot (or
+    # None); unused: table rows. Best assignment of slots to distinct teams.
+    if not slots:
+        return total
+    war = table.war[list(unused)][:, table.col_of_slot[list(slots)]].T.tolist()  # slots x teams
+    if any(v is not None for v in now):
+        for row, v in zip(war, now):
+            row.append(0.0 if v is None else v)
+    pad = max(0, len(slots) - len(war[0]))
+    cost = [[-v for v in row] + [0.0] * pad for row in war]
+    picks = solver.hungarian(cost)
+    return total - sum(cost[i][j] for i, j in enumerate(picks))
+
+
+@lru_cache(maxsize=1024)
+def _ceiling(table, total, slots, now, unused):
+    return ceiling(table, total, slots, now, unused)
+
+
+@lru_cache(maxsize=1024)
+def win_chances(table, rosters: tuple, rounds_left: int, unused: tuple, samples: int = SAMPLES) -> tuple:
+    # rosters: (total, filled mask, this round's WAR per slot or None) per
+    # roster, in letter order. Returns each roster's win share.
+    n_slots = len(table.col_of_slot)
+    # Seeded from the inputs: the same position always shows the same number.
+    rng = np.random.default_rng(abs(hash((rosters, rounds_left, unused))))
+    teams = np.asarray(unused, dtype=np.int64)
+    rounds_left = min(rounds_left, len(teams))
+    if rounds_left:
+        draws = rng.random((samples, len(teams))).argsort(axis=1)[:, :rounds_left]
+        future = table.war[teams[draws]][:, :, table.col_of_slot]  # (samples, rounds, slots)
+    luck = rng.uniform(SHARE, 1.0, (samples, rounds_left + 1, len(rosters)))
+    g = np.arange(samples)
+
+    finals = np.empty((samples, len(rosters)))
+    for d, (total, mask, now) in enumerate(rosters):
+        filled = np.array([mask >> i & 1 for i in range(n_slots)], dtype=bool)
+        filled = np.broadcast_to(filled, (samples, n_slots)).copy()
+        acc = np.full(samples, total)
+        if now is not None:
+            values = np.array([-np.inf if v is None else v for v in now])
+            j = int(values.argmax())
+            if np.isfinite(values[j]):
+                acc += values[j] * luck[:, 0, d]
+                filled[:, j] = True
+        for r in range(rounds_left):
+            values = np.where(filled, -np.inf, future[:, r])
+            j = values.argmax(axis=1)
+            best = values[g, j]
+            acc += np.where(np.isfinite(best), best * luck[:, r + 1, d], 0.0)
+            filled[g, j] = True
+        finals[:, d] = acc
+
+    top = finals.max(axis=1, keepdims=True)
+    winners = np.isclose(finals, top)
+    share = (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+    return tuple(float(x) for x in share)
+
+
+def live(state, samples: int = SAMPLES) -> dict:
+    # {letter: LiveStats} for every roster in the game
+    table = solver.slot_table(state.rules, state.index)
+    slots = state.rules.slots
+    unused = unused_teams(state, table)
+    rounds_left = max(0, len(state.order) - state.round_index - 1)
+
+    out, rosters = {}, []
+    for letter in state.letters:
+        total = round(engine.roster_total(engine.roster(state, letter)), 4)
+        up = upside(state, letter)
+        empty = tuple(slots.index(s) for s in up)
+        now = tuple(up.values())
+        ceil = _ceiling(table, total, empty, now, unused)
+        mask = engine.roster_mask(state, letter)
+        has_now = any(v is not None for v in now)
+        by_slot = tuple(up.get(s) for s in slots) if has_now else None
+        rosters.append((total, mask, by_slot))
+        out[letter] = (up, ceil)
+
+    if engine.is_over(state) or state.round_team is None:
+        totals = [r[0] for r in rosters]
+        best = max(totals)
+        wins = [t == best for t in totals]
+        chances = tuple(w / sum(wins) for w in wins)
+    else:
+        chances = win_chances(table, tuple(rosters), rounds_left, unused, samples)
+    return {letter: LiveStats(up, ceil, chances[i]) for i, (letter, (up, ceil)) in enumerate(out.items())}
@@ -0,0 +1,352 @@
+import argparse
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from war_draft import engine, reload, solver
+
+# JSON draft API for frontends other than the Streamlit apps. One asyncio
+# process serves many games: a game is a DraftState (a few hundred bytes)
+# in a TTL store, and every request is a handful of engine calls on the
+# event loop, so there is no per-player session to keep alive.
+#
+#   POST /games                     {"mode": "hitters" | "pitchers", "seed": 42, "drafters": 2..12}
+#   GET  /games/<id>                state
+#   GET  /games/<id>/options?slot=c&q=rodriguez
+#   POST /games/<id>/picks          {"slot": "c", "player": "Iván Rodríguez"}
+#                                   or {"pass": true} when nothing is left to pick
+#   GET  /games/<id>/result         totals, winner and the perfect draft
+#
+#   python -m war_draft.api --port 8601
+
+TTL = 30 * 60
+MAX_GAMES = 100_000
+MAX_BODY = 16 * 1024
+
+logger = logging.getLogger("war_draft.api")
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class GameStore:
+    # Games by id, least recently used first. A game expires ttl seconds
+    # after it was last touched; the oldest also go once there are
+    # max_games.
+    def __init__(self, ttl: float = TTL, max_games: int = MAX_GAMES, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_games = max_games
+        self.clock = clock
+        self._games = OrderedDict()  # id -> (state, expires at)
+
+    def __len__(self):
+        return len(self._games)
+
+    def _evict(self, now: float):
+        games = self._games
+        while games:
+            gid, (_, expires) = next(iter(games.items()))
+            if expires > now and len(games) <= self.max_games:
+                break
+            del games[gid]
+
+    def add(self, state) -> str:
+        gid = secrets.token_urlsafe(9)
+        now = self.clock()
+        self._games[gid] = (state, now + self.ttl)
+        self._evict(now)
+        return gid
+
+    def get(self, gid: str):
+        now = self.clock()
+        self._evict(now)
+        try:
+            state, _ = self._games[gid]
+        except KeyError:
+            raise HTTPError(404, f"No game {gid}.") from None
+        self._games[gid] = (state, now + self.ttl)
+        self._games.move_to_end(gid)
+        return state
+
+
+def load_modes():
+    # {mode: (rules, index)} for both apps' rule sets. The index is the
+    # current version when a game is created; the game keeps it.
+    modes = reload.LiveModes()
+    for mode in modes:
+        reload.provider(mode).index()  # load now rather than on the first request
+    return modes
+
+
+def pick_json(pick):
+    if pick is None:
+        return None
+    return {
+        "player": pick.player,
+        "war": round(float(pick.war), 1),
+        "team": pick.team,
+        "source_slot": pick.source_slot,
+    }
+
+
+def state_json(gid: str, game) -> dict:
+    over = engine.is_over(game)
+    rosters = game.rosters
+    return {
+        "id": gid,
+        "mode": game.rules.name,
+        "seed": game.seed,
+        "drafters": list(game.letters),
+        "slots": list(game.rules.slots),
+        "labels": [game.rules.slot_label(s) for s in game.rules.slots],
+        "round": game.round_index + 1,
+        "rounds": len(game.order),
+        "pick": game.pick_in_round + 1,
+        "round_team": game.round_team,
+        "on_clock": None if over else engine.current_picker(game),
+        "rosters": {letter: {slot: pick_json(p) for slot, p in r.items()} for letter, r in rosters.items()},
+        "totals": {letter: round(engine.roster_total(r), 1) for letter, r in rosters.items()},
+        "over": over,
+    }
+
+
+def option_names(game, slot: str, letter: str, query: str = None) -> list:
+    # Names only: WAR is what the players are guessing.
+    if engine.pick_at(game, letter, slot) is not None:
+        return []
+    if query is not None:
+        return [p for p, _ in engine.search(game, slot, query, letter=letter)]
+    return [p for p, _ in engine.options(game, slot, letter)]
+
+
+class DraftAPI:
+    def __init__(self, store: GameStore = None):
+        self.store = store if store is not None else GameStore()
+        self.modes = load_modes()
+
+    # ----------------------------
+    # Endpoints
+    # ----------------------------
+    def create(self, body: dict):
+        mode = body.get("mode", "hitters")
+        if not isinstance(mode, str) or mode not in self.modes:
+            raise HTTPError(400, f"mode must be one of {', '.join(self.modes)}.")
+        seed = body.get("seed")
+        if seed is not None and (not isinstance(seed, int) or not 0 <= seed < engine.SEEDS):
+            raise HTTPError(400, f"seed must be an integer from 0 to {engine.SEEDS - 1}.")
+        drafters = body.get("drafters", 2)
+        if not isinstance(drafters, int) or drafters not in engine.LEAGUES:
+            raise HTTPError(400, f"drafters must be an integer from 2 to {engine.MAX_DRAFTERS}.")
+        rules, index = self.modes[mode]
+        game = engine.new_game(rules, index, seed=seed, drafters=drafters)
+        gid = self.store.add(game)
+        return 201, state_json(gid, game)
+
+    def state(self, gid: str):
+        return 200, state_json(gid, self.store.get(gid))
+
+    def options(self, gid: str, query: dict):
+        game = self.store.get(gid)
+        slot = query.get("slot")
+        if slot not in game.rules.slots:
+            raise HTTPError(400, f"slot must be one of {', '.join(game.rules.slots)}.")
+        letter = query.get("roster") or (None if engine.is_over(game) else engine.current_picker(game))
+        if letter not in game.letters:
+            raise HTTPError(400, f"roster must be one of {', '.join(game.letters)}.")
+        return 200, {"slot": slot, "roster": letter, "players": option_names(game, slot, letter, query.get("q"))}
+
+    def pick(self, gid: str, body: dict):
+        game = self.store.get(gid)
+        letter = None if engine.is_over(game) else engine.current_picker(game)
+        if body.get("pass") is True:
+            try:
+                slot = engine.pass_pick(game)
+            except engine.IllegalMove as e:
+                raise HTTPError(409, str(e)) from None
+            return 200, {
+                "roster": letter,
+                "slot": slot,
+                "pick": None,
+                "message": f"Team {letter} had nothing left to pick and passed.",
+                "state": state_json(gid, game),
+            }
+        slot, player = body.get("slot"), body.get("player")
+        if not isinstance(slot, str) or not isinstance(player, str):
+            raise HTTPError(400, "slot and player are required.")
+        try:
+            pick = engine.apply_move(game, engine.Move(slot, player))
+        except engine.IllegalMove as e:
+            raise HTTPError(409, str(e)) from None
+        return 200, {
+            "roster": letter,
+            "slot": slot,
+            "pick": pick_json(pick),
+            "message": game.rules.describe(letter, slot, pick),
+            "state": state_json(gid, game),
+        }
+
+    def result(self, gid: str):
+        game = self.store.get(gid)
+        if not engine.is_over(game):
+            raise HTTPError(409, "The draft is not over yet.")
+        totals = {letter: round(engine.roster_total(r), 1) for letter, r in game.rosters.items()}
+        table = solver.slot_table(game.rules, game.index)
+        perfect, _ = solver.perfect_draft(table, [game.index.teams[tid] for tid in game.order])
+        return 200, {
+            "totals": totals,
+            "winner": engine.winner(game),
+            "perfect": round(perfect, 1),
+            "seed": game.seed,
+        }
+
+    def route(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        def payload():
+            if not body:
+                return {}
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "Body must be JSON.") from None
+            if not isinstance(data, dict):
+                raise HTTPError(400, "Body must be a JSON object.")
+            return data
+
+        if not parts or parts[0] != "games" or len(parts) > 3:
+            raise HTTPError(404, f"No route for {url.path}.")
+        if len(parts) == 1:
+            if method == "POST":
+                return self.create(payload())
+        elif len(parts) == 2:
+            if method == "GET":
+                return self.state(parts[1])
+        elif parts[2] == "options" and method == "GET":
+            return self.options(parts[1], query)
+        elif parts[2] == "picks" and method == "POST":
+            return self.pick(parts[1], payload())
+        elif parts[2] == "result" and method == "GET":
+            return self.result(parts[1])
+        elif parts[2] not in ("options", "picks", "result"):
+            raise HTTPError(404, f"No route for {url.path}.")
+        raise HTTPError(405, f"{method} is not allowed on {url.path}.")
+
+    # ----------------------------
+    # HTTP/1.1
+    # ----------------------------
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Keep-alive connection: one request at a time, until the client
+        # closes it or sends Connection: close.
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                if length < 0:
+                    # No way to tell where the body ends: answer, then close.
+                    status, data = 400, {"error": "Invalid Content-Length."}
+                    keep_alive = False
+                elif length > MAX_BODY:
+                    status, data = 413, {"error": "Request body too large."}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, data = self.respond(method, target, body)
+                writer.write(self.encode(status, data, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, method: str, target: str, body: bytes):
+        if method == "OPTIONS":
+            return 204, None
+        try:
+            return self.route(method, target, body)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception:
+            # A bug answers this one request; the connection stays usable.
+            logger.exception("%s %s failed", method, target)
+            return 500, {"error": "Internal server error."}
+
+    @staticmethod
+    def encode(status: int, data, keep_alive: bool) -> bytes:
+        payload = b"" if data is None else json.dumps(data, separators=(",", ":")).encode()
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            # Any page (the index.html hub included) may call the API.
+            "Access-Control-Allow-Origin: *\r\n"
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+            "Access-Control-Allow-Headers: Content-Type\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + payload
+
+
+async def serve(host: str, port: int, ttl: float = TTL):
+    api = DraftAPI(GameStore(ttl=ttl))
+    server = await asyncio.start_server(api.handle, host, port)
+    print(f"war_draft API on http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the draft over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8601)
+    parser.add_argument("--ttl", type=float, default=TTL, help="seconds an idle game is kept")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.ttl))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
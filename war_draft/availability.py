@@ -0,0 +1,116 @@
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+
+# ----------------------------
+# Shared option tables
+# ----------------------------
+# A round blocks at most a couple of players, so the same filtered lists come
+# up in every game that draws the same team. They are cached once per
+# process, keyed on the index's team object, instead of inside each game.
+@lru_cache(maxsize=1024)
+def _filtered(team_pool, data_slot: str, blocked: frozenset) -> tuple:
+    return tuple(c for c in team_pool.players_at(data_slot) if c[0] not in blocked)
+
+
+def _util_key(entry) -> tuple:
+    # util_order's sort key: best WAR first, then name
+    return -entry[1], entry[0]
+
+
+def _best_unused(team_pool, player: str, used: frozenset):
+    for war, data_slot in team_pool.seasons.get(player, ()):
+        if (player, data_slot) not in used:
+            return war
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _util_order(team_pool, used: frozenset) -> tuple:
+    # Best remaining season per player, best first, with the (player,
+    # data_slot) seasons in used gone. Built a pick at a time: the order
+    # for used is the order without its last season, with that one player
+    # moved down to their next best season (a bisect out and an insort back
+    # in). Every step is cached, so a round's picks extend each other and
+    # games drafting the same seasons share the result.
+    if not used:
+        return team_pool.util_order
+    last = max(used)
+    player = last[0]
+    parent = used - {last}
+    order = _util_order(team_pool, parent)
+    before = _best_unused(team_pool, player, parent)
+    after = _best_unused(team_pool, player, used)
+    if before == after:
+        return order
+    out = list(order)
+    if before is not None:
+        del out[bisect_left(out, (-before, player), key=_util_key)]
+    if after is not None:
+        insort(out, (player, after), key=_util_key)
+    return tuple(out)
+
+
+@lru_cache(maxsize=1024)
+def _util_filtered(team_pool, used: frozenset, taken: frozenset) -> tuple:
+    return tuple(e for e in _util_order(team_pool, used) if e[0] not in taken)
+
+
+class DraftAvailability:
+    # What the round in progress blocks. A round holds one pick per roster;
+    # the game adds each pick as it is made and starts a new one per round,
+    # so every check here is a set lookup whatever the league size.
+    #   taken:   roster -> players that roster already took from the round team
+    #            (only rosters that picked this round have an entry)
+    #   used_at: data_slot -> players whose season at that slot is gone this round
+    #   used_by: player -> data slots used this round
+    __slots__ = ("taken", "used_at", "used_by")
+
+    def __init__(self):
+        self.taken = {}
+        self.used_at = {}
+        self.used_by = {}
+
+    def mark_taken(self, roster: str, player: str):
+        self.taken.setdefault(roster, set()).add(player)
+
+    def mark_used(self, player: str, data_slot: str):
+        self.used_at.setdefault(data_slot, set()).add(player)
+        self.used_by.setdefault(player, set()).add(data_slot)
+
+    def is_taken(self, roster: str, player: str) -> bool:
+        return player in self.taken.get(roster, ())
+
+    def slots_used(self, player: str) -> set:
+        return self.used_by.get(player, set())
+
+    def blocked(self, roster: str, data_slot: str) -> frozenset:
+        return frozenset(self.used_at.get(data_slot, ())) | frozenset(self.taken.get(roster, ()))
+
+    def options(self, roster: str, team_pool, data_slot: str) -> tuple:
+        # ((player, war), ...) from the index. With nothing blocked this is
+        # the index tuple itself.
+        blocked = self.blocked(roster, data_slot)
+        if not blocked:
+            return team_pool.players_at(data_slot)
+        return _filtered(team_pool, data_slot, blocked)
+
+    # ----------------------------
+    # UTIL
+    # ----------------------------
+    def util_season(self, team_pool, player: str):
+        # (war, data_slot) of the player's best season not yet used this round
+        used_slots = self.used_by.get(player, ())
+        for season in team_pool.seasons.get(player, ()):
+            if season[1] not in used_slots:
+                return season
+        return None
+
+    def util_options(self, roster: str, team_pool) -> tuple:
+        taken = frozenset(self.taken.get(roster, ()))
+        if not self.used_by and not taken:
+            return team_pool.util_order
+        used = frozenset((p, s) for p, slots in self.used_by.items() for s in slots)
+        if not taken:
+            return _util_order(team_pool, used)
+        return _util_filtered(team_pool, used, taken)
@@ -0,0 +1,162 @@
+from war_draft import engine
+from war_draft.engine import DraftState, Move
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+# ----------------------------
+# Precomputed tables
+# ----------------------------
+def _candidates(rules, index, team: str) -> dict:
+    # column -> ((war, player, data_slot), ...) best first
+    def build():
+        tp = index.team(team)
+        return {col: tuple(engine.candidates(rules, tp, col)) for col in engine.slot_columns(rules)}
+
+    return index.derived(("bot", rules, team), build)
+
+
+def _best_by_team(rules, index) -> dict:
+    # team -> {column: best WAR on offer at the start of a round}
+    def build():
+        return {
+            team: {col: (c[0][0] if c else 0.0) for col, c in _candidates(rules, index, team).items()}
+            for team in index.teams
+        }
+
+    return index.derived(("bot best", rules), build)
+
+
+def expected_best(state: DraftState) -> dict:
+    # column -> mean best WAR over the teams that can still come up
+    best = _best_by_team(state.rules, state.index)
+    used = state.used_teams
+    remaining = [t for t in state.teams if not used >> state.index.team_id(t) & 1]
+    cols = engine.slot_columns(state.rules)
+    if not remaining:
+        return {c: 0.0 for c in cols}
+    return {c: sum(best[t][c] for t in remaining) / len(remaining) for c in cols}
+
+
+def prepare(rules, index, team: str):
+    # Build the candidate table for a team ahead of its round.
+    _candidates(rules, index, team)
+
+
+# ----------------------------
+# In-round search
+# ----------------------------
+class _Search:
+    # Alpha-beta over the picks left in the current round. Nodes are keyed on
+    # (ply, filled-slot bitmasks, used (player, slot) seasons), so transposed
+    # pick orders share one entry. Values are from the bot's point of view:
+    # WAR drafted from here on, plus the expected WAR of the slots left open
+    # for future rounds, minus the same for the opponent.
+    def __init__(self, state: DraftState, top_n: int):
+        self.rules = state.rules
+        self.slots = self.rules.slots
+        self.cols = [engine.slot_column(self.rules, s) for s in self.slots]
+        self.cands = _candidates(state.rules, state.index, state.round_team)
+        self.top_n = top_n
+
+        order = engine.round_order(state.round_index)
+        self.pickers = order[state.pick_in_round :]
+        self.bot = self.pickers[0]
+
+        expected = expected_best(state)
+        self.future = [expected[c] for c in self.cols]
+        self.tt = {}
+
+    def open_value(self, mask: int) -> float:
+        return sum(v for i, v in enumerate(self.future) if not mask >> i & 1)
+
+    def moves(self, mask: int, used: frozenset) -> list:
+        # (war, slot index, player, data_slot) for the top-N candidates of
+        # the first empty slot in each column
+        out = []
+        seen_cols = set()
+        for i, col in enumerate(self.cols):
+            if mask >> i & 1 or col in seen_cols:
+                continue
+            seen_cols.add(col)
+            seen_players = set()
+            for w, p, s in self.cands[col]:
+                if (p, s) in used or p in seen_players:
+                    continue
+                seen_players.add(p)
+                out.append((w, i, p, s))
+                if len(seen_players) >= self.top_n:
+                    break
+        out.sort(key=lambda m: -m[0])
+        return out
+
+    def value(self, ply: int, masks: tuple, used: frozenset, alpha: float, beta: float) -> float:
+        if ply == len(self.pickers):
+            return self.open_value(masks[0]) - self.open_value(masks[1])
+
+        key = (ply, masks, used)
+        hit = self.tt.get(key)
+        if hit is not None:
+            v, flag = hit
+            if flag == EXACT:
+                return v
+            if flag == LOWER:
+                alpha = max(alpha, v)
+            else:
+                beta = min(beta, v)
+            if alpha >= beta:
+                return v
+
+        a0, b0 = alpha, beta
+        side = 0 if self.pickers[ply] == self.bot else 1
+        moves = self.moves(masks[side], used)
+        if not moves:
+            best = self.value(ply + 1, masks, used, alpha, beta)
+        elif side == 0:
+            best = float("-inf")
+            for w, i, p, s in moves:
+                child = (masks[0] | 1 << i, masks[1])
+                best = max(best, w + self.value(ply + 1, child, used | {(p, s)}, alpha, beta))
+                alpha = max(alpha, best)
+                if alpha >= beta:
+                    break
+        else:
+            best = float("inf")
+            for w, i, p, s in moves:
+                child = (masks[0], masks[1] | 1 << i)
+                best = min(best, -w + self.value(ply + 1, child, used | {(p, s)}, alpha, beta))
+                beta = min(beta, best)
+                if alpha >= beta:
+                    break
+
+        flag = EXACT
+        if best <= a0:
+            flag = UPPER
+        elif best >= b0:
+            flag = LOWER
+        self.tt[key] = (best, flag)
+        return best
+
+    def best_move(self, state: DraftState):
+        masks = (engine.roster_mask(state, self.bot), engine.roster_mask(state, self.other()))
+        used = frozenset((p, s) for p, slots in state.avail.used_by.items() for s in slots)
+
+        best, best_move = float("-inf"), None
+        for w, i, p, s in self.moves(masks[0], used):
+            child = (masks[0] | 1 << i, masks[1])
+            v = w + self.value(1, child, used | {(p, s)}, best, float("inf"))
+            if v > best:
+                best, best_move = v, Move(self.slots[i], p)
+        return best_move
+
+    def other(self) -> str:
+        return next(letter for letter in engine.LETTERS if letter != self.bot)
+
+
+def choose_move(state: DraftState, top_n: int = 3):
+    # Best move for the team on the clock, or None if it has nothing to pick.
+    if state.round_team is None:
+        return None
+    if len(state.letters) != 2:
+        raise ValueError("The bot searches two-drafter games only.")
+    return _Search(state, top_n).best_move(state)
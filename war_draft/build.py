@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from war_draft.data import BASE_DIR, HITTER_POOL_CSV, PITCH_POOL_CSV
+
+# Columnar artifact built from the pool CSVs. The CSVs stay the editable
+# source of truth; each build is keyed by the source file's SHA-1 so a
+# stale artifact is never used.
+#
+#   pool_build/<mode>/<sha1[:16]>/
+#       manifest.json
+#       teams.npy  slots.npy  players.npy    fixed-width string tables
+#       team_offsets.npy  (T+1,) int32       rows of team t: [off[t], off[t+1])
+#       slot_id.npy       (N,)   int8
+#       player_id.npy     (N,)   int32
+#       war.npy           (N,)   float32
+#   pool_build/<mode>/current.json           {"dir": ..., "source_sha1": ...}
+#
+# Rows are already normalized the way the index wants them: one row per
+# (team, slot, player) holding the best WAR, DH/UTIL folded, nulls dropped,
+# ordered by team then slot then player.
+#
+# .npy files open with mmap_mode="r", so every process that loads the same
+# build shares the page cache instead of parsing text.
+
+FORMAT = 1
+BUILD_DIR = BASE_DIR / "pool_build"
+ARRAYS = ("team_offsets", "slot_id", "player_id", "war")
+STRINGS = ("teams", "slots", "players")
+KEEP_BUILDS = 2
+
+MODES = {
+    "hitters": HITTER_POOL_CSV,
+    "pitchers": PITCH_POOL_CSV,
+}
+
+
+class Bundle:
+    __slots__ = ("mode", "path", "manifest", "teams", "slots", "players", "team_offsets", "slot_id", "player_id", "war")
+
+    def __init__(self, mode: str, path: Path, manifest: dict, arrays: dict):
+        self.mode = mode
+        self.path = path
+        self.manifest = manifest
+        for name in ARRAYS + STRINGS:
+            setattr(self, name, arrays[name])
+
+    @property
+    def source_sha1(self) -> str:
+        return self.manifest["source_sha1"]
+
+    def team_rows(self, team_pos: int):
+        # (slot, player, war) for one team, as Python objects
+        lo, hi = int(self.team_offsets[team_pos]), int(self.team_offsets[team_pos + 1])
+        slots = self.slots[self.slot_id[lo:hi]].tolist()
+        players = self.players[self.player_id[lo:hi]].tolist()
+        # float32 storage: round back to the precision the CSV is written in
+        wars = [round(w, 4) for w in self.war[lo:hi].tolist()]
+        return zip(slots, players, wars)
+
+
+# ----------------------------
+# Build
+# ----------------------------
+def canonical_rows(mode: str, pool) -> dict:
+    # team -> [(slot, player, war), ...] normalized like the index
+    from war_draft.index import HitterIndex, PitchIndex, canonical_hitter_rows, canonical_pitcher_rows
+
+    if mode == "hitters":
+        grouped = HitterIndex._group_rows(pool)
+        return {t: canonical_hitter_rows(rows) for t, rows in grouped.items()}
+    grouped = PitchIndex._group_rows(pool)
+    return {t: [("p", p, w) for p, w in canonical_pitcher_rows(rows)] for t, rows in grouped.items()}
+
+
+def encode(rows_by_team: dict) -> tuple:
+    teams = sorted(rows_by_team)
+    slots = sorted({s for rows in rows_by_team.values() for s, _, _ in rows})
+    players = sorted({p for rows in rows_by_team.values() for _, p, _ in rows})
+    slot_pos = {s: i for i, s in enumerate(slots)}
+    player_pos = {p: i for i, p in enumerate(players)}
+
+    offsets = [0]
+    slot_id, player_id, war = [], [], []
+    for t in teams:
+        for s, p, w in sorted(rows_by_team[t], key=lambda r: (slot_pos[r[0]], r[1].lower(), r[1])):
+            slot_id.append(slot_pos[s])
+            player_id.append(player_pos[p])
+            war.append(w)
+        offsets.append(len(war))
+
+    arrays = {
+        "teams": np.array(teams, dtype=np.str_),
+        "slots": np.array(slots, dtype=np.str_),
+        "players": np.array(players, dtype=np.str_),
+        "team_offsets": np.array(offsets, dtype=np.int32),
+        "slot_id": np.array(slot_id, dtype=np.int8),
+        "player_id": np.array(player_id, dtype=np.int32),
+        "war": np.array(war, dtype=np.float32),
+    }
+    return teams, arrays
+
+
+def write_bundle(mode: str, source: Path, sha1: str, rows_by_team: dict, root: Path = BUILD_DIR) -> Path:
+    teams, arrays = encode(rows_by_team)
+    mode_dir = root / mode
+    mode_dir.mkdir(parents=True, exist_ok=True)
+
+    final = mode_dir / sha1[:16]
+    if not (final / "manifest.json").exists():
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=mode_dir))
+        for name, arr in arrays.items():
+            np.save(tmp / f"{name}.npy", arr, allow_pickle=False)
+        manifest = {
+            "format": FORMAT,
+            "mode": mode,
+            "source": source.name,
+            "source_sha1": sha1,
+            "rows": int(arrays["war"].shape[0]),
+            "teams": len(teams),
+            "players": int(arrays["players"].shape[0]),
+            "built_at": int(time.time()),
+        }
+        (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+        try:
+            os.replace(tmp, final)
+        except OSError:
+            # another process finished the same build first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    pointer = mode_dir / f".current.{os.getpid()}.tmp"
+    pointer.write_text(json.dumps({"dir": final.name, "source_sha1": sha1}) + "\n")
+    os.replace(pointer, mode_dir / "current.json")
+
+    _prune(mode_dir, keep=final.name)
+    return final
+
+
+def _prune(mode_dir: Path, keep: str):
+    # keep the current build plus the most recent older ones
+    builds = sorted(
+        (d for d in mode_dir.iterdir() if d.is_dir() and not d.name.startswith(".") and d.name != keep),
+        key=lambda d: d.stat().st_mtime,
+        reverse=True,
+    )
+    for d in builds[KEEP_BUILDS - 1 :]:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def build(mode: str, source: Path = None, root: Path = BUILD_DIR) -> Path:
+    from war_draft.data import load_hitter_pool, load_pitch_pool
+
+    source = Path(source or MODES[mode])
+    load = load_hitter_pool if mode == "hitters" else load_pitch_pool
+    pool = load(source, use_build=False)
+    return write_bundle(mode, source, pool.sha1, canonical_rows(mode, pool), root)
+
+
+# ----------------------------
+# Load
+# ----------------------------
+def open_bundle(mode: str, sha1: str, root: Path = BUILD_DIR):
+    # Memory-mapped build for this exact source version, or None.
+    mode_dir = root / mode
+    try:
+        pointer = json.loads((mode_dir / "current.json").read_text())
+    except (OSError, ValueError):
+        pointer = None
+
+    if pointer and pointer.get("source_sha1") == sha1:
+        path = mode_dir / pointer["dir"]
+    else:
+        path = mode_dir / sha1[:16]
+
+    try:
+        manifest = json.loads((path / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != FORMAT or manifest.get("source_sha1") != sha1:
+        return None
+
+    arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r", allow_pickle=False) for name in ARRAYS + STRINGS}
+    return Bundle(mode, path, manifest, arrays)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build memory-mappable pool artifacts from the CSVs")
+    parser.add_argument("modes", nargs="*", metavar="mode", help=f"{', '.join(sorted(MODES))} (default: all)")
+    parser.add_argument("--out", type=Path, default=BUILD_DIR)
+    args = parser.parse_args(argv)
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown mode: {', '.join(sorted(unknown))}")
+
+    for mode in args.modes or sorted(MODES):
+        t0 = time.perf_counter()
+        path = build(mode, root=args.out)
+        manifest = json.loads((path / "manifest.json").read_text())
+        size = sum(f.stat().st_size for f in path.iterdir())
+        print(
+            f"{mode}: {manifest['rows']} rows, {manifest['teams']} teams, {manifest['players']} players "
+            f"-> {path} ({size / 1024:.0f} KiB, {(time.perf_counter() - t0) * 1000:.0f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import hashlib
+import io
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas is only imported to parse a CSV. Processes that load a matching
+# columnar build (war_draft.build) map it and never import pandas.
+
+# ----------------------------
+# Paths
+# ----------------------------
+BASE_DIR = Path(__file__).resolve().parent.parent
+HITTER_POOL_CSV = BASE_DIR / "game_pool.csv"
+PITCH_POOL_CSV = BASE_DIR / "pitch_game_pool.csv"
+
+# Set to 0 to never read or write the columnar build (war_draft.build).
+USE_BUILD = os.environ.get("WAR_DRAFT_USE_BUILD", "1") != "0"
+
+
+class PoolError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Pool:
+    path: Path
+    sha1: str
+    teams: tuple
+    _frame: "pd.DataFrame" = None
+    # memory-mapped war_draft.build.Bundle for this exact source version
+    bundle: object = None
+
+    def frame(self) -> "pd.DataFrame":
+        # The normalized frame is shared by every session in the process.
+        # Hand out shallow copies: with copy-on-write (always on from pandas
+        # 3, hence the pin in requirements.txt) a caller that writes to its
+        # copy gets private data and never touches the cached frame.
+        if self._frame is not None:
+            return self._frame.copy(deep=False)
+
+        # Build-backed pools never parsed the CSV; expand the columnar rows.
+        # These are already canonical (one row per team/slot/player, DH and
+        # UTIL folded), which the index groups to the same result.
+        import pandas as pd
+
+        b = self.bundle
+        counts = b.team_offsets[1:] - b.team_offsets[:-1]
+        return pd.DataFrame(
+            {
+                "team": b.teams.repeat(counts),
+                "slot": b.slots[b.slot_id],
+                "player": b.players[b.player_id],
+                "war": b.war.astype("float64").round(4),
+            }
+        )
+
+
+# ----------------------------
+# Normalization (runs once per file version)
+# ----------------------------
+def _check_columns(df: "pd.DataFrame", required: set, name: str):
+    missing = required - set(df.columns)
+    if missing:
+        raise PoolError(f"{name} is missing columns: {missing}")
+
+
+def normalize_hitters(df: "pd.DataFrame", name: str = "game_pool.csv") -> "pd.DataFrame":
+    import pandas as pd
+
+    _check_columns(df, {"team", "slot", "player", "war"}, name)
+
+    df["team"] = df["team"].astype(str).str.strip().str.lower()
+    df["slot"] = df["slot"].astype(str).str.strip().str.lower()
+    df["player"] = df["player"].astype(str).str.strip()
+    df["war"] = pd.to_numeric(df["war"], errors="coerce")
+    return df
+
+
+def normalize_pitchers(df: "pd.DataFrame", name: str = "pitch_game_pool.csv") -> "pd.DataFrame":
+    import pandas as pd
+
+    _check_columns(df, {"team", "player", "war"}, name)
+
+    df["team"] = df["team"].astype(str).str.strip().str.lower()
+    df["player"] = df["player"].astype(str).str.strip()
+    df["war"] = pd.to_numeric(df["war"], errors="coerce")
+    df = df.dropna(subset=["team", "player", "war"])
+    return df
+
+
+# ----------------------------
+# Process-wide cache
+# ----------------------------
+# Streamlit re-executes the app script on every interaction, but imported
+# modules live for the whole process, so this cache is shared by all sessions.
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _from_build(mode: str, path: Path, sha1: str):
+    from war_draft import build
+
+    bundle = build.open_bundle(mode, sha1)
+    if bundle is None:
+        return None
+    return Pool(path=path, sha1=sha1, teams=tuple(bundle.teams.tolist()), bundle=bundle)
+
+
+def _write_build(mode: str, pool: Pool) -> Pool:
+    # First process to see a new CSV version writes the build for the rest.
+    from war_draft import build
+
+    try:
+        build.write_bundle(mode, pool.path, pool.sha1, build.canonical_rows(mode, pool))
+    except OSError:
+        return pool
+    return _from_build(mode, pool.path, pool.sha1) or pool
+
+
+def _load(path: Path, normalize, mode: str, use_build: bool) -> Pool:
+    path = Path(path)
+    st_ = os.stat(path)
+    stat_key = (st_.st_mtime_ns, st_.st_size)
+    key = (str(path), mode, use_build)
+
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == stat_key:
+        return entry[1]
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == stat_key:
+            return entry[1]
+
+        raw = path.read_bytes()
+        sha1 = hashlib.sha1(raw).hexdigest()
+
+        # Touched but unchanged (e.g. a checkout): keep the parsed pool.
+        if entry is not None and entry[1].sha1 == sha1:
+            _cache[key] = (stat_key, entry[1])
+            return entry[1]
+
+        pool = _from_build(mode, path, sha1) if use_build else None
+        if pool is None:
+            import pandas as pd
+
+            df = normalize(pd.read_csv(io.BytesIO(raw)), path.name)
+            teams = tuple(sorted(df["team"].dropna().unique().tolist()))
+            pool = Pool(path=path, sha1=sha1, teams=teams, _frame=df)
+            if use_build:
+                pool = _write_build(mode, pool)
+
+        _cache[key] = (stat_key, pool)
+        return pool
+
+
+def load_hitter_pool(path: Path = HITTER_POOL_CSV, use_build: bool = USE_BUILD) -> Pool:
+    return _load(path, normalize_hitters, "hitters", use_build)
+
+
+def load_pitch_pool(path: Path = PITCH_POOL_CSV, use_build: bool = USE_BUILD) -> Pool:
+    return _load(path, normalize_pitchers, "pitchers", use_build)
@@ -0,0 +1,416 @@
+import random
+from array import array
+from typing import NamedTuple
+
+from war_draft import search as name_search
+from war_draft.availability import DraftAvailability
+
+LETTERS = ("A", "B")
+MAX_DRAFTERS = 12
+# Roster letters of a league by size; two drafters are LETTERS.
+LEAGUES = {n: tuple(chr(ord("A") + i) for i in range(n)) for n in range(2, MAX_DRAFTERS + 1)}
+# Seeds are drawn from, and accepted in, range(SEEDS); they fit a SQLite INTEGER.
+SEEDS = 2**32
+
+
+class IllegalMove(ValueError):
+    pass
+
+
+class Move(NamedTuple):
+    slot: str
+    player: str
+
+
+class Pick(NamedTuple):
+    player: str
+    war: float
+    source_slot: str
+    team: str
+
+
+# ----------------------------
+# Rules
+# ----------------------------
+class HitterRules:
+    name = "hitters"
+    slots = ("c", "1b", "2b", "3b", "ss", "of1", "of2", "of3", "util")
+    data_slots = ("c", "1b", "2b", "3b", "ss", "of", "dh")
+    util_slot = "util"
+
+    @staticmethod
+    def data_slot(ui_slot: str) -> str:
+        if ui_slot in ("of1", "of2", "of3"):
+            return "of"
+        return ui_slot
+
+    @staticmethod
+    def slot_label(ui_slot: str) -> str:
+        if ui_slot in ("of1", "of2", "of3"):
+            return "OF"
+        return ui_slot.upper()
+
+    def options(self, avail: DraftAvailability, letter: str, team_pool, ui_slot: str) -> tuple:
+        if ui_slot == "util":
+            return avail.util_options(letter, team_pool)
+        return avail.options(letter, team_pool, self.data_slot(ui_slot))
+
+    def resolve(self, avail: DraftAvailability, team_pool, ui_slot: str, player: str):
+        # (war, source data slot) for drafting player into ui_slot
+        if ui_slot == "util":
+            season = avail.util_season(team_pool, player)
+            if season is None:
+                raise IllegalMove(f"No remaining season available for {player} in UTIL.")
+            return season
+
+        data_slot = self.data_slot(ui_slot)
+        if data_slot in avail.slots_used(player):
+            raise IllegalMove(f"{player} at {data_slot.upper()} is already taken this round.")
+        war = team_pool.best_war(player, data_slot)
+        if war is None:
+            raise IllegalMove(f"No data found for {player} at {data_slot.upper()}.")
+        return war, data_slot
+
+    @staticmethod
+    def describe(letter: str, ui_slot: str, pick: Pick) -> str:
+        if ui_slot == "util":
+            return f"Team {letter} drafted {pick.player} in UTIL for {pick.war:.1f} WAR."
+        return f"Team {letter} drafted {pick.player} at {pick.source_slot.upper()} for {pick.war:.1f} WAR."
+
+
+class PitchRules:
+    name = "pitchers"
+    slots = ("p1", "p2", "p3", "p4", "p5", "p6", "p7")
+    data_slots = ("p",)
+    util_slot = None
+
+    @staticmethod
+    def data_slot(ui_slot: str) -> str:
+        return "p"
+
+    @staticmethod
+    def slot_label(ui_slot: str) -> str:
+        return ui_slot.upper()
+
+    def options(self, avail: DraftAvailability, letter: str, team_pool, ui_slot: str) -> tuple:
+        return avail.options(letter, team_pool, "p")
+
+    def resolve(self, avail: DraftAvailability, team_pool, ui_slot: str, player: str):
+        # block drafting the same pitcher from the same team within the round
+        if "p" in avail.slots_used(player):
+            raise IllegalMove(f"{player} is already taken this round.")
+        war = team_pool.war_by_player.get(player)
+        if war is None:
+            raise IllegalMove(f"No data found for {player}.")
+        return war, "p"
+
+    @staticmethod
+    def describe(letter: str, ui_slot: str, pick: Pick) -> str:
+        return f"Team {letter} drafted {pick.player} for {pick.war:.1f} WAR."
+
+
+HITTERS = HitterRules()
+PITCHERS = PitchRules()
+
+
+# ----------------------------
+# State
+# ----------------------------
+class DraftState:
+    # Per-session game state, kept small so one process can hold thousands of
+    # drafts. Names and WAR live in the shared index; a game only holds ids:
+    #   order:  index team id of every round, drawn when the game starts
+    #   picks:  3 ints per roster slot, (player id, team id, data slot id)
+    #           or -1s while open; roster r, slot s starts at 3 * (r * S + s)
+    #   filled: bitset of filled roster slots, bit r * S + s
+    #   letters: roster letters in draft order, LETTERS unless a league
+    # rosters, round_team and used_teams are views rebuilt from these. avail
+    # is kept for the round in progress: apply_move adds each pick to it and
+    # a new round starts empty, so a pick costs the same in any league size.
+    __slots__ = (
+        "rules",
+        "index",
+        "teams",
+        "letters",
+        "seed",
+        "order",
+        "picks",
+        "filled",
+        "round_index",
+        "pick_in_round",
+        "_avail",
+        "__weakref__",
+    )
+
+    def __init__(self, rules, index, teams=None, rng=None, seed=None, order=None, drafters=2):
+        if drafters not in LEAGUES:
+            raise ValueError(f"A league has 2 to {MAX_DRAFTERS} drafters.")
+        self.rules = rules
+        self.index = index
+        self.teams = tuple(teams if teams is not None else index.teams)
+        self.letters = LEAGUES[drafters]
+
+        # The whole team order is drawn up front: the same seed replays the
+        # same teams, and upcoming rounds can be prepared ahead of time.
+        # A caller-supplied rng is used as is and leaves no seed to replay;
+        # a given order (a stored game's round teams) is played as is.
+        if order is not None:
+            self.seed = None
+            drawn = list(order)
+        elif rng is None:
+            self.seed = seed if seed is not None else random.randrange(SEEDS)
+            rng = random.Random(self.seed)
+        else:
+            self.seed = None
+        if order is None:
+            drawn = rng.sample(self.teams, min(len(rules.slots), len(self.teams)))
+        self.order = bytes(index.team_id(t) for t in drawn)
+
+        self.picks = array("i", [-1]) * (3 * len(self.letters) * len(rules.slots))
+        self.filled = 0
+        self.round_index = 0
+        self.pick_in_round = 0
+        self._avail = None
+        index.games.add(self)
+
+    def copy(self) -> "DraftState":
+        other = DraftState.__new__(DraftState)
+        other.rules = self.rules
+        other.index = self.index
+        other.teams = self.teams
+        other.letters = self.letters
+        other.seed = self.seed
+        other.order = self.order
+        other.picks = array("i", self.picks)
+        other.filled = self.filled
+        other.round_index = self.round_index
+        other.pick_in_round = self.pick_in_round
+        other._avail = None
+        return other
+
+    @property
+    def round_team_id(self) -> int:
+        return self.order[self.round_index] if self.round_index < len(self.order) else -1
+
+    @property
+    def round_team(self):
+        tid = self.round_team_id
+        return self.index.teams[tid] if tid >= 0 else None
+
+    @property
+    def used_teams(self) -> int:
+        # bitset of index team ids drawn so far, the current round's included
+        used = 0
+        for tid in self.order[: self.round_index + 1]:
+            used |= 1 << tid
+        return used
+
+    @property
+    def rosters(self) -> dict:
+        # {letter: {ui_slot: Pick or None}}
+        return {letter: roster(self, letter) for letter in self.letters}
+
+    @property
+    def avail(self) -> DraftAvailability:
+        # What the round in progress blocks: the picks made from the round team
+        avail = self._avail
+        if avail is None:
+            avail = self._avail = DraftAvailability()
+            tid = self.round_team_id
+            if tid >= 0 and self.pick_in_round:
+                # Only a copy lands here mid-round: scan the rosters that
+                # already picked this round.
+                picks, n_slots = self.picks, len(self.rules.slots)
+                for letter in round_order(self.round_index, self.letters)[: self.pick_in_round]:
+                    r = self.letters.index(letter)
+                    for i in range(3 * r * n_slots, 3 * (r + 1) * n_slots, 3):
+                        if picks[i + 1] == tid:
+                            player = self.index.player_name(picks[i])
+                            avail.mark_used(player, self.rules.data_slots[picks[i + 2]])
+                            avail.mark_taken(letter, player)
+        return avail
+
+
+def _bit(state: DraftState, letter: str, ui_slot: str) -> int:
+    slots = state.rules.slots
+    return state.letters.index(letter) * len(slots) + slots.index(ui_slot)
+
+
+def pick_at(state: DraftState, letter: str, ui_slot: str):
+    bit = _bit(state, letter, ui_slot)
+    if not state.filled >> bit & 1:
+        return None
+    pid, tid, sid = state.picks[3 * bit : 3 * bit + 3]
+    if pid < 0:
+        return None  # passed: no legal pick was left
+    player, team = state.index.player_name(pid), state.index.teams[tid]
+    source_slot = state.rules.data_slots[sid]
+    war = state.index.team(team).best_war(player, source_slot)
+    return Pick(player, war, source_slot, team)
+
+
+def roster(state: DraftState, letter: str) -> dict:
+    return {s: pick_at(state, letter, s) for s in state.rules.slots}
+
+
+def roster_mask(state: DraftState, letter: str) -> int:
+    # bitset of the roster's filled slots, bit i for rules.slots[i]
+    n = len(state.rules.slots)
+    return state.filled >> (state.letters.index(letter) * n) & ((1 << n) - 1)
+
+
+def new_game(rules, index, teams=None, rng=None, seed=None, order=None, drafters=2) -> DraftState:
+    return DraftState(rules, index, teams, rng, seed, order, drafters)
+
+
+def slot_column(rules, ui_slot: str) -> str:
+    # Slots that draw from the same candidates share a column: the data slot,
+    # or the UTIL slot itself since it draws from every season.
+    return ui_slot if ui_slot == rules.util_slot else rules.data_slot(ui_slot)
+
+
+def slot_columns(rules) -> tuple:
+    # distinct columns, in slot order
+    columns = []
+    for s in rules.slots:
+        c = slot_column(rules, s)
+        if c not in columns:
+            columns.append(c)
+    return tuple(columns)
+
+
+def candidates(rules, team_pool, column: str) -> list:
+    # [(war, player, data_slot)] a column can draw from the team, best
+    # first: every season for UTIL, else the column's data slot.
+    if column == rules.util_slot:
+        cands = [(w, p, s) for p, seasons in team_pool.seasons.items() for w, s in seasons]
+    else:
+        cands = [(w, p, column) for p, w in team_pool.players_at(column)]
+    cands.sort(key=lambda t: (-t[0], t[1]))
+    return cands
+
+
+def round_order(round_index: int, letters: tuple = LETTERS) -> tuple:
+    # snake: A picks first in even rounds, the last letter in odd rounds
+    return letters if round_index % 2 == 0 else letters[::-1]
+
+
+def current_picker(state: DraftState) -> str:
+    return round_order(state.round_index, state.letters)[state.pick_in_round]
+
+
+def round_pool(state: DraftState):
+    if state.round_team is None:
+        return None
+    return state.index.team(state.round_team)
+
+
+def advance_pick(state: DraftState):
+    state.pick_in_round += 1
+    if state.pick_in_round >= len(state.letters):
+        state.pick_in_round = 0
+        state.round_index += 1
+        state._avail = None
+
+
+def upcoming_teams(state: DraftState) -> list:
+    # Round teams still to come, next first. Kept off the views: nothing
+    # shown to players or the bot should know them.
+    return [state.index.teams[tid] for tid in state.order[state.round_index + 1 :]]
+
+
+def options(state: DraftState, ui_slot: str, letter: str = None) -> tuple:
+    team_pool = round_pool(state)
+    if team_pool is None:
+        return ()
+    letter = letter or current_picker(state)
+    return state.rules.options(state.avail, letter, team_pool, ui_slot)
+
+
+def search(state: DraftState, ui_slot: str, query: str, k: int = None, letter: str = None) -> tuple:
+    # Up to k of the slot's options matching query, ranked by name only.
+    opts = options(state, ui_slot, letter)
+    if not opts:
+        return ()
+    by_name = dict(opts)
+    idx = name_search.column_index(round_pool(state), slot_column(state.rules, ui_slot))
+    names = idx.rank(query, by_name, k if k is not None else name_search.TOP_K)
+    return tuple((p, by_name[p]) for p in names)
+
+
+def empty_slots(state: DraftState, letter: str) -> list:
+    mask = roster_mask(state, letter)
+    return [s for i, s in enumerate(state.rules.slots) if not mask >> i & 1]
+
+
+def legal_moves(state: DraftState) -> list:
+    if state.round_team is None:
+        return []
+    letter = current_picker(state)
+    return [Move(s, p) for s in empty_slots(state, letter) for p, _ in options(state, s, letter)]
+
+
+def apply_move(state: DraftState, move: Move) -> Pick:
+    letter = current_picker(state)
+    team_pool = round_pool(state)
+
+    if team_pool is None:
+        raise IllegalMove("The draft is over.")
+    if move.slot not in state.rules.slots:
+        raise IllegalMove(f"Unknown slot {move.slot}.")
+    bit = _bit(state, letter, move.slot)
+    if state.filled >> bit & 1:
+        raise IllegalMove(f"Team {letter} already filled {state.rules.slot_label(move.slot)}.")
+    avail = state.avail
+    if avail.is_taken(letter, move.player):
+        raise IllegalMove(f"Team {letter} already drafted {move.player} from this team.")
+
+    war, source_slot = state.rules.resolve(avail, team_pool, move.slot, move.player)
+
+    pick = Pick(move.player, war, source_slot, state.round_team)
+    state.picks[3 * bit : 3 * bit + 3] = array(
+        "i", (state.index.player_id(move.player), state.round_team_id, state.rules.data_slots.index(source_slot))
+    )
+    state.filled |= 1 << bit
+    avail.mark_used(move.player, source_slot)
+    avail.mark_taken(letter, move.player)
+
+    advance_pick(state)
+    return pick
+
+
+def pass_pick(state: DraftState) -> str:
+    # The drafter on the clock has nothing legal left to pick from the round
+    # team (a big league can empty a short position): their first open slot
+    # is closed with no pick and 0 WAR. Returns that slot.
+    if state.round_team is None:
+        raise IllegalMove("The draft is over.")
+    if legal_moves(state):
+        raise IllegalMove(f"Team {current_picker(state)} still has a legal pick.")
+    slot = empty_slots(state, current_picker(state))[0]
+    state.filled |= 1 << _bit(state, current_picker(state), slot)
+    advance_pick(state)
+    return slot
+
+
+# ----------------------------
+# Results
+# ----------------------------
+def roster_total(roster: dict) -> float:
+    total = 0.0
+    for v in roster.values():
+        if v is not None:
+            total += float(v.war)
+    return total
+
+
+def is_over(state: DraftState) -> bool:
+    return state.filled == (1 << len(state.letters) * len(state.rules.slots)) - 1
+
+
+def winner(state: DraftState) -> str:
+    # letter of the best total, or "TIE" when more than one roster has it
+    totals = {letter: roster_total(roster(state, letter)) for letter in state.letters}
+    best = max(totals.values())
+    top = [letter for letter, total in totals.items() if total == best]
+    return top[0] if len(top) == 1 else "TIE"
@@ -0,0 +1,272 @@
+import argparse
+import hashlib
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from war_draft import engine
+from war_draft.data import BASE_DIR, load_hitter_pool, load_pitch_pool
+from war_draft.index import hitter_index, pitch_index
+
+# Static, browser-only build of both games for plain file hosting:
+#
+#   site/
+#       index.html  play.html  draft_rules.js  logos/
+#       data/<mode>/manifest.json               rules, teams, shard names
+#       data/<mode>/<team>.<sha1[:10]>.json     one team's pool
+#
+# play.html draws the round teams itself and fetches each team's shard the
+# first time it comes up, so a pick costs no request at all. Shard names
+# carry a content hash and never change, so hosts can cache them forever.
+# The rules run in static/draft_rules.js; the export replays a random game
+# corpus through it under node and fails if it disagrees with the engine.
+
+SITE_DIR = BASE_DIR / "site"
+STATIC_DIR = BASE_DIR / "static"
+CHECK_GAMES = 200
+
+MODES = {
+    "hitters": lambda: (engine.HITTERS, hitter_index(load_hitter_pool())),
+    "pitchers": lambda: (engine.PITCHERS, pitch_index(load_pitch_pool())),
+}
+
+
+# Cards for the hub page. play.html only exists in the exported site, so the
+# repo's index.html carries a marker and export() fills it in.
+PLAY_CARDS_MARKER = "<!-- play-cards: python -m war_draft.export adds the browser-only games here -->"
+PLAY_CARD = """<a class="card" href="play.html?mode={mode}">
+        <h2>{title}, in your browser</h2>
+        <p class="sub">Same rules, no server: the whole draft runs on this page.</p>
+        <span class="pill">Play now</span>
+      </a>"""
+TITLES = {
+    "hitters": "Position Player WAR Draft",
+    "pitchers": "Pitching WAR Draft",
+}
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def shard(rules, team_pool) -> dict:
+    # One team's pool: names once, everything else as indexes into them.
+    if rules.util_slot is None:
+        seasons = {p: ((w, "p"),) for p, w in team_pool.pitchers}
+    else:
+        seasons = team_pool.seasons
+    players = sorted(seasons)
+    pid = {p: i for i, p in enumerate(players)}
+    ds = {s: i for i, s in enumerate(rules.data_slots)}
+    out = {
+        "players": players,
+        "seasons": [[x for w, s in seasons[p] for x in (w, ds[s])] for p in players],
+        "slots": [[pid[p] for p, _ in team_pool.players_at(s)] for s in rules.data_slots],
+    }
+    if rules.util_slot is not None:
+        out["util"] = [pid[p] for p, _ in team_pool.util_order]
+    return out
+
+
+def manifest(rules, index) -> dict:
+    return {
+        "mode": rules.name,
+        "slots": list(rules.slots),
+        "labels": [rules.slot_label(s) for s in rules.slots],
+        "slot_data": [None if s == rules.util_slot else rules.data_slot(s) for s in rules.slots],
+        "data_slots": list(rules.data_slots),
+        "util_slot": rules.util_slot,
+        "rounds": min(len(rules.slots), len(index.teams)),
+        "teams": list(index.teams),
+        "shards": {},
+    }
+
+
+def export_mode(mode: str, out: Path) -> dict:
+    rules, index = MODES[mode]()
+    mode_dir = out / "data" / mode
+    if mode_dir.exists():
+        shutil.rmtree(mode_dir)
+    mode_dir.mkdir(parents=True)
+
+    man = manifest(rules, index)
+    for team in index.teams:
+        text = _dumps(shard(rules, index.team(team)))
+        name = f"{team}.{hashlib.sha1(text.encode()).hexdigest()[:10]}.json"
+        (mode_dir / name).write_text(text, encoding="utf-8")
+        man["shards"][team] = name
+    (mode_dir / "manifest.json").write_text(_dumps(man), encoding="utf-8")
+    return man
+
+
+def export(out: Path = SITE_DIR, modes=tuple(MODES)) -> list:
+    out.mkdir(parents=True, exist_ok=True)
+    for name in ("play.html", "draft_rules.js"):
+        shutil.copy2(STATIC_DIR / name, out / name)
+    hub = (BASE_DIR / "index.html").read_text(encoding="utf-8")
+    cards = "\n\n      ".join(PLAY_CARD.format(mode=m, title=TITLES[m]) for m in modes)
+    (out / "index.html").write_text(hub.replace(PLAY_CARDS_MARKER, cards), encoding="utf-8")
+    if (STATIC_DIR / "logos").is_dir():
+        shutil.copytree(STATIC_DIR / "logos", out / "logos", dirs_exist_ok=True)
+    return [export_mode(mode, out) for mode in modes]
+
+
+# ----------------------------
+# Rule check
+# ----------------------------
+def corpus(games: int, seed: int, modes=tuple(MODES)) -> list:
+    # Random games through the Python engine with what the JS must match:
+    # option lists before each move, each move's pick or error, final totals.
+    # About one move in six is a random, often illegal, slot and player.
+    rng = random.Random(seed)
+    loaded = {mode: MODES[mode]() for mode in modes}
+    out = []
+    for g in range(games):
+        mode = modes[g % len(modes)]
+        rules, index = loaded[mode]
+        state = engine.new_game(rules, index, seed=rng.randrange(2**32))
+        steps = []
+        while not engine.is_over(state):
+            letter = engine.current_picker(state)
+            check = {rng.choice(rules.slots)}
+            if rules.util_slot is not None:
+                check.add(rules.util_slot)
+            options = {s: [list(o) for o in engine.options(state, s, letter)] for s in sorted(check)}
+
+            if rng.random() < 1 / 6:
+                # Mostly open slots and players this round already touched,
+                # so the moves get past "already filled" to the rule checks.
+                team_pool = engine.round_pool(state)
+                names = sorted({p for s in rules.data_slots for p, _ in team_pool.players_at(s)})
+                touched = sorted(state.avail.used_by)
+                slots = engine.empty_slots(state, letter) if rng.random() < 0.8 else rules.slots
+                player = rng.choice(touched) if touched and rng.random() < 0.6 else rng.choice(names + ["Nobody"])
+                move = engine.Move(rng.choice(slots), player)
+            else:
+                move = rng.choice(engine.legal_moves(state))
+            try:
+                pick = engine.apply_move(state, move)
+                result = {"pick": [pick.player, pick.war, pick.source_slot, pick.team]}
+                result["message"] = rules.describe(letter, move.slot, pick)
+            except engine.IllegalMove as e:
+                result = {"error": str(e)}
+            steps.append({"options": options, "move": list(move), "result": result})
+
+        totals = {letter: engine.roster_total(r) for letter, r in state.rosters.items()}
+        order = [index.teams[tid] for tid in state.order]
+        out.append({"mode": mode, "order": order, "steps": steps, "totals": totals, "winner": engine.winner(state)})
+    return out
+
+
+def war_formats(modes=tuple(MODES)) -> list:
+    # [war, f"{war:.1f}"] for every WAR value, for the messages' rounding
+    wars = set()
+    for mode in modes:
+        rules, index = MODES[mode]()
+        for team in index.teams:
+            team_pool = index.team(team)
+            wars.update(w for s in rules.data_slots for _, w in team_pool.players_at(s))
+    return [[w, f"{w:.1f}"] for w in sorted(wars)]
+
+
+NODE_CHECK = r"""
+const fs = require("fs");
+const path = require("path");
+const [rulesPath, dataDir, corpusPath] = process.argv.slice(2);
+const { Draft, IllegalMove, fmt1 } = require(rulesPath);
+const { games, formats } = JSON.parse(fs.readFileSync(corpusPath, "utf8"));
+const manifests = {};
+const same = (a, b) => JSON.stringify(a) === JSON.stringify(b);
+const mismatches = [];
+let checked = 0;
+const miss = (game, step, what, expected, actual) => mismatches.push({ game, step, what, expected, actual });
+
+games.forEach((game, g) => {
+  const man = (manifests[game.mode] ||= JSON.parse(fs.readFileSync(path.join(dataDir, game.mode, "manifest.json"), "utf8")));
+  const draft = new Draft(man, game.order);
+  for (const team of game.order) {
+    draft.addShard(team, JSON.parse(fs.readFileSync(path.join(dataDir, game.mode, man.shards[team]), "utf8")));
+  }
+  game.steps.forEach((step, i) => {
+    const letter = draft.currentPicker();
+    for (const [slot, expected] of Object.entries(step.options)) {
+      checked++;
+      const actual = draft.options(slot, letter);
+      if (!same(actual, expected)) miss(g, i, `options ${slot}`, expected.slice(0, 5), actual.slice(0, 5));
+    }
+    const [slot, player] = step.move;
+    let result;
+    try {
+      const pick = draft.apply(slot, player);
+      result = { pick: [pick.player, pick.war, pick.source_slot, pick.team], message: draft.describe(letter, slot, pick) };
+    } catch (e) {
+      if (!(e instanceof IllegalMove)) throw e;
+      result = { error: e.message };
+    }
+    checked++;
+    if (!same(result, step.result)) miss(g, i, `move ${slot} ${player}`, step.result, result);
+  });
+  const totals = { A: draft.total("A"), B: draft.total("B") };
+  checked += 2;
+  if (!same(totals, game.totals)) miss(g, -1, "totals", game.totals, totals);
+  if (draft.winner() !== game.winner) miss(g, -1, "winner", game.winner, draft.winner());
+});
+for (const [war, expected] of formats) {
+  checked++;
+  if (fmt1(war) !== expected) miss(null, -1, `format ${war}`, expected, fmt1(war));
+}
+console.log(JSON.stringify({ games: games.length, checked, mismatches: mismatches.length, first: mismatches.slice(0, 5) }));
+"""
+
+
+def check_rules(out: Path = SITE_DIR, games: int = CHECK_GAMES, seed: int = 2024, modes=tuple(MODES)) -> dict:
+    # Replays corpus() through out/draft_rules.js with node.
+    node = shutil.which("node")
+    if node is None:
+        raise RuntimeError("node is needed to check the exported rules (or pass --no-check).")
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_path = Path(tmp) / "corpus.json"
+        corpus_path.write_text(
+            _dumps({"games": corpus(games, seed, modes), "formats": war_formats(modes)}), encoding="utf-8"
+        )
+        script = Path(tmp) / "check.js"
+        script.write_text(NODE_CHECK, encoding="utf-8")
+        proc = subprocess.run(
+            [node, str(script), str((out / "draft_rules.js").resolve()), str((out / "data").resolve()), str(corpus_path)],
+            capture_output=True,
+            text=True,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"rule check failed to run:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a static, browser-only build of both games")
+    parser.add_argument("--out", type=Path, default=SITE_DIR)
+    parser.add_argument("--check-games", type=int, default=CHECK_GAMES, help="random games to check the JS rules on")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--no-check", action="store_true", help="skip the rule check (it needs node)")
+    args = parser.parse_args(argv)
+
+    for man in export(args.out):
+        mode_dir = args.out / "data" / man["mode"]
+        size = sum(p.stat().st_size for p in mode_dir.iterdir())
+        print(f"{man['mode']}: {len(man['shards'])} shards, {size / 1024:.0f} KiB in {mode_dir}")
+
+    if args.no_check:
+        return
+    report = check_rules(args.out, args.check_games, args.seed)
+    print(f"rule check: {report['games']} games, {report['checked']} comparisons, {report['mismatches']} mismatches")
+    if report["mismatches"]:
+        for m in report["first"]:
+            print(json.dumps(m, ensure_ascii=False))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
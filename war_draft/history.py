@@ -0,0 +1,292 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+from war_draft import engine
+from war_draft.data import BASE_DIR
+
+logger = logging.getLogger("war_draft.history")
+
+# Finished drafts in a local SQLite file. Apps hand a game to record(),
+# which snapshots it into a plain GameRecord and queues it; one writer
+# thread drains the queue and inserts whole batches in a single
+# transaction, so a rerun never waits on the disk.
+#
+# picks doubles as the replay log: rows are only ever appended, numbered
+# in draft order, and together with games.teams and games.drafters they
+# replay the draft. A pass (engine.pass_pick) is a row with passed = 1, the
+# slot it closed, an empty player and 0 WAR.
+#
+# Set WAR_DRAFT_HISTORY to another file, or to an empty string to keep no
+# history.
+
+HISTORY_PATH = os.environ.get("WAR_DRAFT_HISTORY", str(BASE_DIR / "history.sqlite3"))
+BATCH = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    seed INTEGER,
+    teams TEXT NOT NULL,
+    drafters INTEGER NOT NULL DEFAULT 2,
+    bot TEXT,
+    winner TEXT NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rosters (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    roster TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    bot INTEGER NOT NULL,
+    total REAL NOT NULL,
+    PRIMARY KEY (game_id, roster)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS picks (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    seq INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    roster TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    team TEXT NOT NULL,
+    player TEXT NOT NULL,
+    war REAL NOT NULL,
+    passed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rosters_top ON rosters (mode, total DESC);
+CREATE INDEX IF NOT EXISTS picks_team_player ON picks (mode, team, player);
+CREATE INDEX IF NOT EXISTS picks_slot_war ON picks (mode, slot, war);
+"""
+
+# Columns added after the first schema: (table, column, definition). Older
+# files get them on connect; their games were all two-drafter, no passes.
+MIGRATIONS = (
+    ("games", "drafters", "INTEGER NOT NULL DEFAULT 2"),
+    ("picks", "passed", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+class GameRecord(NamedTuple):
+    mode: str
+    seed: int
+    teams: tuple
+    drafters: int
+    bot: str  # letter the computer drafted for, or None
+    totals: dict  # {letter: total WAR}
+    winner: str
+    finished_at: float
+    picks: tuple  # (roster, slot, team, player, war) in draft order; player None for a pass
+
+
+def snapshot(state, bot: str = None) -> GameRecord:
+    rules = state.rules
+    teams = tuple(state.index.teams[tid] for tid in state.order)
+    rosters = state.rosters
+    by_team = {
+        (letter, pick.team): (slot, pick) for letter, r in rosters.items() for slot, pick in r.items() if pick
+    }
+    # A roster's passes closed its first open slot each time, so in draft
+    # order they took its pick-less slots in slot order.
+    passed = {letter: [s for s, pick in r.items() if pick is None] for letter, r in rosters.items()}
+    picks = []
+    for round_index, team in enumerate(teams):
+        for letter in engine.round_order(round_index, state.letters):
+            if (letter, team) in by_team:
+                slot, pick = by_team[letter, team]
+                picks.append((letter, slot, team, pick.player, float(pick.war)))
+            elif passed[letter]:
+                picks.append((letter, passed[letter].pop(0), team, None, 0.0))
+    totals = {letter: engine.roster_total(r) for letter, r in rosters.items()}
+    return GameRecord(
+        mode=rules.name,
+        seed=state.seed,
+        teams=teams,
+        drafters=len(state.letters),
+        bot=bot,
+        totals=totals,
+        winner=engine.winner(state),
+        finished_at=time.time(),
+        picks=tuple(picks),
+    )
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(path or HISTORY_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    migrate(conn)
+    return conn
+
+
+def migrate(conn: sqlite3.Connection):
+    with conn:
+        for table, column, definition in MIGRATIONS:
+            have = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in have:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def insert(conn: sqlite3.Connection, records):
+    # One transaction for the whole batch.
+    with conn:
+        for rec in records:
+            game_id = conn.execute(
+                "INSERT INTO games (mode, seed, teams, drafters, bot, winner, finished_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (rec.mode, rec.seed, ",".join(rec.teams), rec.drafters, rec.bot, rec.winner, rec.finished_at),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO rosters (game_id, roster, mode, bot, total) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (game_id, letter, rec.mode, int(letter == rec.bot), total)
+                    for letter, total in rec.totals.items()
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO picks (game_id, seq, mode, roster, slot, team, player, war, passed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (game_id, seq, rec.mode, letter, slot, team, player or "", war, int(player is None))
+                    for seq, (letter, slot, team, player, war) in enumerate(rec.picks)
+                ],
+            )
+
+
+class Writer:
+    # Background writer: submit() only queues, the thread does the I/O.
+    def __init__(self, path: str = None, batch: int = BATCH):
+        self.path = path or HISTORY_PATH
+        self.batch = batch
+        self.written = 0
+        self.failed = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, record: GameRecord):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="war-draft-history", daemon=True)
+                    self._thread.start()
+        self._queue.put(record)
+
+    def flush(self, timeout: float = None) -> bool:
+        # Wait until everything submitted so far is written.
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _run(self):
+        conn = None
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self.batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [i for i in items if isinstance(i, GameRecord)]
+            if records:
+                try:
+                    if conn is None:
+                        conn = connect(self.path)
+                    insert(conn, records)
+                    self.written += len(records)
+                except Exception:
+                    # History is best effort; the games themselves are fine,
+                    # and the thread stays up for the next batch.
+                    logger.exception("could not write %d games to %s", len(records), self.path)
+                    self.failed += len(records)
+            for i in items:
+                if isinstance(i, threading.Event):
+                    i.set()
+
+
+_writer = None
+
+
+def writer() -> Writer:
+    global _writer
+    if _writer is None:
+        _writer = Writer()
+    return _writer
+
+
+def record(state, bot: str = None):
+    # Queue a finished game; returns immediately.
+    if not HISTORY_PATH or not engine.is_over(state):
+        return
+    writer().submit(snapshot(state, bot))
+
+
+# ----------------------------
+# Leaderboards
+# ----------------------------
+def top_totals(conn: sqlite3.Connection, mode: str, limit: int = 10, include_bot: bool = False) -> list:
+    # [(total, roster, game_id, finished_at)]
+    return conn.execute(
+        "SELECT r.total, r.roster, r.game_id, g.finished_at FROM rosters r JOIN games g ON g.id = r.game_id"
+        " WHERE r.mode = ? AND (? OR r.bot = 0) ORDER BY r.total DESC LIMIT ?",
+        (mode, include_bot, limit),
+    ).fetchall()
+
+
+def leaderboard(mode: str, limit: int = 5) -> list:
+    # top_totals() for the apps: read-only, and [] when there is no history yet.
+    if not HISTORY_PATH or not os.path.exists(HISTORY_PATH):
+        return []
+    try:
+        conn = sqlite3.connect(f"file:{HISTORY_PATH}?mode=ro", uri=True)
+        try:
+            return top_totals(conn, mode, limit)
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return []
+
+
+def most_drafted(conn: sqlite3.Connection, mode: str, team: str, limit: int = 10) -> list:
+    # [(player, times drafted)]
+    return conn.execute(
+        "SELECT player, COUNT(*) AS n FROM picks WHERE mode = ? AND team = ? AND passed = 0"
+        " GROUP BY player ORDER BY n DESC, player LIMIT ?",
+        (mode, team, limit),
+    ).fetchall()
+
+
+def average_by_slot(conn: sqlite3.Connection, mode: str) -> list:
+    # [(slot, average WAR, picks)]
+    return conn.execute(
+        "SELECT slot, AVG(war), COUNT(*) FROM picks WHERE mode = ? AND passed = 0 GROUP BY slot",
+        (mode,),
+    ).fetchall()
+
+
+def moves(conn: sqlite3.Connection, game_id: int) -> list:
+    # [engine.Move, or None for a pass] in draft order, for replaying a stored game
+    rows = conn.execute("SELECT slot, player, passed FROM picks WHERE game_id = ? ORDER BY seq", (game_id,))
+    return [None if passed else engine.Move(slot, player) for slot, player, passed in rows]
+
+
+def replay(conn: sqlite3.Connection, game_id: int, rules, index):
+    # The stored game's finished DraftState, rebuilt move by move.
+    seed, teams, drafters = conn.execute(
+        "SELECT seed, teams, drafters FROM games WHERE id = ?", (game_id,)
+    ).fetchone()
+    state = engine.new_game(rules, index, order=teams.split(","), drafters=drafters)
+    state.seed = seed
+    for move in moves(conn, game_id):
+        if move is None:
+            engine.pass_pick(state)
+        else:
+            engine.apply_move(state, move)
+    return state
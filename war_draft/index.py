@@ -0,0 +1,255 @@
+import hashlib
+import threading
+import weakref
+
+from war_draft.data import Pool
+
+DH_LABELS = {"dh", "d h", "designated_hitter"}
+
+
+def _name_key(item) -> str:
+    return item[0].lower()
+
+
+# ----------------------------
+# Per-team partitions
+# ----------------------------
+def canonical_hitter_rows(rows) -> list:
+    # rows: iterable of (slot, player, war) for one team, war not null.
+    # Returns one (slot, player, best_war) per (slot, player) with DH labels
+    # folded into "dh". "util" rows only stand for DH-only players; everyone
+    # else's util row duplicates one of their real positions and is dropped.
+    rows = [(("dh" if s in DH_LABELS else s), p, w) for s, p, w in rows]
+    non_util_players = {p for s, p, _ in rows if s != "util"}
+
+    best = {}
+    for s, p, w in rows:
+        if s == "util":
+            if p in non_util_players:
+                continue
+            s = "dh"
+        k = (s, p)
+        if k not in best or w > best[k]:
+            best[k] = w
+    return [(s, p, w) for (s, p), w in best.items()]
+
+
+class HitterTeam:
+    __slots__ = ("team", "slot_players", "seasons", "util_order")
+
+    def __init__(self, team: str, rows):
+        self.team = team
+
+        best = canonical_hitter_rows(rows)
+        seasons = {}
+        for s, p, w in best:
+            seasons.setdefault(p, []).append((w, s))
+
+        by_slot = {}
+        for s, p, w in best:
+            by_slot.setdefault(s, []).append((p, w))
+
+        # data_slot -> ((player, best_war), ...) in display order
+        self.slot_players = {s: tuple(sorted(v, key=_name_key)) for s, v in by_slot.items()}
+
+        # player -> ((war, data_slot), ...) best season first
+        self.seasons = {p: tuple(sorted(v, key=lambda t: (-t[0], t[1]))) for p, v in seasons.items()}
+
+        # (player, best_war) for UTIL when nothing has been used this round
+        self.util_order = tuple(
+            sorted(((p, v[0][0]) for p, v in self.seasons.items()), key=lambda t: (-t[1], t[0]))
+        )
+
+    def players_at(self, data_slot: str) -> tuple:
+        return self.slot_players.get(data_slot, ())
+
+    def best_war(self, player: str, data_slot: str):
+        for w, s in self.seasons.get(player, ()):
+            if s == data_slot:
+                return w
+        return None
+
+
+def canonical_pitcher_rows(rows) -> list:
+    # rows: iterable of (player, war) for one team; one best row per player
+    best = {}
+    for p, w in rows:
+        if p not in best or w > best[p]:
+            best[p] = w
+    return list(best.items())
+
+
+class PitchTeam:
+    __slots__ = ("team", "pitchers", "war_by_player")
+
+    def __init__(self, team: str, rows):
+        self.team = team
+
+        best = dict(canonical_pitcher_rows(rows))
+
+        # ((player, best_war), ...) in display order
+        self.pitchers = tuple(sorted(best.items(), key=_name_key))
+        self.war_by_player = best
+
+    def players_at(self, data_slot: str) -> tuple:
+        return self.pitchers
+
+    def best_war(self, player: str, data_slot: str):
+        return self.war_by_player.get(player)
+
+
+# ----------------------------
+# Lazily built, per-team index
+# ----------------------------
+class _TeamIndex:
+    def __init__(self, pool: Pool):
+        self.pool = pool
+        self.teams = pool.teams
+        # A memory-mapped build is already grouped by team; a CSV-backed pool
+        # is grouped once here.
+        self._bundle = pool.bundle
+        self._team_pos = {t: i for i, t in enumerate(self.teams)}
+        self._rows = None if self._bundle is not None else self._group_rows(pool)
+        self._built = {}
+        self._lock = threading.Lock()
+        # Player names are interned as they get drafted, so games can hold
+        # small integer ids instead of their own strings.
+        self._players = []
+        self._player_ids = {}
+        # Games started on this version (engine.DraftState registers itself),
+        # so a reload can tell when an older version is no longer in play.
+        self.games = weakref.WeakSet()
+        self._digests = {}
+        # Tables other modules derive from this version (bot, solver). They
+        # live here so they go with the index once a reload retires it.
+        self._derived = {}
+
+    def _rows_for(self, team: str):
+        if self._bundle is None:
+            return self._rows.get(team, ())
+        pos = self._team_pos.get(team)
+        if pos is None:
+            return ()
+        return self._from_bundle(self._bundle.team_rows(pos))
+
+    def team(self, team: str):
+        built = self._built.get(team)
+        if built is not None:
+            return built
+        with self._lock:
+            built = self._built.get(team)
+            if built is None:
+                built = self._build(team, self._rows_for(team))
+                self._built[team] = built
+            return built
+
+    def team_id(self, team: str) -> int:
+        return self._team_pos[team]
+
+    def player_id(self, player: str) -> int:
+        pid = self._player_ids.get(player)
+        if pid is not None:
+            return pid
+        with self._lock:
+            pid = self._player_ids.get(player)
+            if pid is None:
+                pid = len(self._players)
+                self._players.append(player)
+                self._player_ids[player] = pid
+            return pid
+
+    def player_name(self, pid: int) -> str:
+        return self._players[pid]
+
+    def derived(self, key, build):
+        # build() once per key; racing first calls may both build, and the
+        # first one stored wins.
+        table = self._derived.get(key)
+        if table is None:
+            table = self._derived.setdefault(key, build())
+        return table
+
+    def warm(self, teams=None):
+        for t in teams if teams is not None else self.teams:
+            self.team(t)
+
+    def digest(self, team: str) -> str:
+        # Content hash of one team's rows, to compare versions of the pool.
+        d = self._digests.get(team)
+        if d is None:
+            rows = sorted(self._rows_for(team))
+            d = self._digests[team] = hashlib.sha1(repr(rows).encode()).hexdigest()
+        return d
+
+    def adopt(self, old: "_TeamIndex") -> list:
+        # Share old's built partitions for teams whose rows did not change.
+        # Returns the teams that changed or are new in this version.
+        changed = []
+        for t in self.teams:
+            if t in old._team_pos and old.digest(t) == self.digest(t):
+                built = old._built.get(t)
+                if built is not None:
+                    with self._lock:
+                        self._built.setdefault(t, built)
+            else:
+                changed.append(t)
+        return changed
+
+
+class HitterIndex(_TeamIndex):
+    @staticmethod
+    def _group_rows(pool: Pool) -> dict:
+        df = pool.frame().dropna(subset=["war", "player", "slot"])
+        rows = {}
+        for t, s, p, w in zip(df["team"], df["slot"], df["player"], df["war"]):
+            rows.setdefault(t, []).append((s, p, float(w)))
+        return rows
+
+    @staticmethod
+    def _from_bundle(rows):
+        return rows
+
+    @staticmethod
+    def _build(team: str, rows) -> HitterTeam:
+        return HitterTeam(team, rows)
+
+
+class PitchIndex(_TeamIndex):
+    @staticmethod
+    def _group_rows(pool: Pool) -> dict:
+        df = pool.frame()
+        rows = {}
+        for t, p, w in zip(df["team"], df["player"], df["war"]):
+            rows.setdefault(t, []).append((p, float(w)))
+        return rows
+
+    @staticmethod
+    def _from_bundle(rows):
+        return [(p, w) for _, p, w in rows]
+
+    @staticmethod
+    def _build(team: str, rows) -> PitchTeam:
+        return PitchTeam(team, rows)
+
+
+# One index per pool version, shared by every session in the process.
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_for(pool: Pool, cls):
+    key = (cls.__name__, str(pool.path))
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None or idx.pool.sha1 != pool.sha1:
+            idx = cls(pool)
+            _indexes[key] = idx
+        return idx
+
+
+def hitter_index(pool: Pool) -> HitterIndex:
+    return _index_for(pool, HitterIndex)
+
+
+def pitch_index(pool: Pool) -> PitchIndex:
+    return _index_for(pool, PitchIndex)
@@ -0,0 +1,410 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from war_draft.data import BASE_DIR, HITTER_POOL_CSV, PITCH_POOL_CSV, PoolError
+from war_draft.index import DH_LABELS
+
+# Builds game_pool.csv and pitch_game_pool.csv from raw season-level stats.
+#
+# Raw inputs: a directory of CSVs, one or more files per kind, recognized by
+# name prefix (batting.csv, batting_2024.csv, ...). Teams use the pool's
+# team keys ("red_sox"); case and spaces are normalized.
+#
+#   batting*.csv    season, team, player, war          one row per stint
+#   fielding*.csv   season, team, player, pos, games   C 1B 2B 3B SS LF CF RF OF DH P
+#   pitching*.csv   season, team, player, war
+#
+# A hitter season counts at every position he played MIN_GAMES games at,
+# and always at his most-played one; OF spots fold into "of", DH into "dh".
+# Pitchers batting are left out. Seasons with no fielding but DH (or no
+# fielding at all) are "dh", which the index offers in UTIL only.
+#
+# Incremental state lives in pool_ingest/:
+#
+#   files.json                      raw file name -> sha1 of what was spilled
+#   spill/<file>/<team>/<season>.csv  the file's rows for one partition
+#   spill/<file>/index.json         "<team>/<season>" -> sha1 of that spill
+#   agg/<mode>/<team>/<season>.json {"hash": ..., "rows": [[slot, player, war], ...]}
+#
+# A partition is one (team, season). Raw files are streamed CHUNK_ROWS rows
+# at a time into their spills, and only files whose sha1 changed are read
+# again. A partition is re-aggregated only when the hash over its spills
+# changed, and a team's pool rows are re-merged only when one of its
+# partitions did, so adding a season reads one new file and aggregates one
+# season per team. Output rows are canonical, one (team, slot, player) with
+# the best WAR, and both CSVs are replaced atomically.
+
+FORMAT = 1
+RAW_DIR = BASE_DIR / "raw"
+WORK_DIR = BASE_DIR / "pool_ingest"
+CHUNK_ROWS = 50_000
+MIN_GAMES = 20
+
+KINDS = {
+    "batting": ("season", "team", "player", "war"),
+    "fielding": ("season", "team", "player", "pos", "games"),
+    "pitching": ("season", "team", "player", "war"),
+}
+MODE_KINDS = {
+    "hitters": ("batting", "fielding"),
+    "pitchers": ("pitching",),
+}
+OUTPUTS = {
+    "hitters": HITTER_POOL_CSV,
+    "pitchers": PITCH_POOL_CSV,
+}
+
+POSITIONS = {"c": "c", "1b": "1b", "2b": "2b", "3b": "3b", "ss": "ss", "lf": "of", "cf": "of", "rf": "of", "of": "of"}
+POSITIONS.update({label: "dh" for label in DH_LABELS})
+SLOT_ORDER = ("c", "1b", "2b", "3b", "ss", "of", "dh")
+
+
+def team_key(team: str) -> str:
+    return "_".join(team.strip().lower().split())
+
+
+def kind_of(path: Path):
+    for kind in KINDS:
+        if path.name.startswith(kind) and path.suffix == ".csv":
+            return kind
+    return None
+
+
+def file_sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_json(path: Path, obj):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(obj, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+# ----------------------------
+# Spill: raw file -> per-partition files
+# ----------------------------
+def _parse(kind: str, row: dict):
+    # (team, season) and the fields the partition keeps, or None to skip
+    try:
+        season = int(row["season"])
+        team = team_key(row["team"] or "")
+        player = (row["player"] or "").strip()
+        if kind == "fielding":
+            pos = (row["pos"] or "").strip().lower()
+            kept = (player, pos, int(float(row["games"])))
+        else:
+            kept = (player, float(row["war"]))
+    except (TypeError, ValueError):
+        return None
+    if not team or not player:
+        return None
+    return (team, season), kept
+
+
+def spill(path: Path, kind: str, dest: Path, chunk_rows: int = CHUNK_ROWS) -> dict:
+    # Streams path into dest/<team>/<season>.csv, holding at most
+    # chunk_rows parsed rows at a time. Returns "<team>/<season>" -> sha1.
+    if dest.exists():
+        shutil.rmtree(dest)
+    dest.mkdir(parents=True)
+    hashes = {}
+    buffers = {}
+    buffered = 0
+
+    def flush():
+        for (team, season), rows in buffers.items():
+            buf = io.StringIO()
+            csv.writer(buf, lineterminator="\n").writerows(rows)
+            text = buf.getvalue()
+            key = f"{team}/{season}"
+            hashes.setdefault(key, hashlib.sha1()).update(text.encode("utf-8"))
+            part = dest / team / f"{season}.csv"
+            part.parent.mkdir(exist_ok=True)
+            with open(part, "a", encoding="utf-8", newline="") as f:
+                f.write(text)
+        buffers.clear()
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        header = {c.strip().lower() for c in reader.fieldnames or ()}
+        missing = set(KINDS[kind]) - header
+        if missing:
+            raise PoolError(f"{path.name} is missing columns: {missing}")
+        reader.fieldnames = [c.strip().lower() for c in reader.fieldnames]
+
+        for row in reader:
+            parsed = _parse(kind, row)
+            if parsed is None:
+                continue
+            key, kept = parsed
+            buffers.setdefault(key, []).append(kept)
+            buffered += 1
+            if buffered >= chunk_rows:
+                flush()
+                buffered = 0
+        flush()
+
+    index = {k: h.hexdigest() for k, h in sorted(hashes.items())}
+    _write_json(dest / "index.json", index)
+    return index
+
+
+def _read_spill(path: Path):
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.reader(f)
+
+
+# ----------------------------
+# Aggregate: one (team, season) partition
+# ----------------------------
+def hitter_rows(batting, fielding, min_games: int = MIN_GAMES) -> list:
+    # batting: (player, war) stints; fielding: (player, pos, games).
+    # Returns [(slot, player, war)], one per slot the player qualifies at.
+    war = {}
+    for player, w in batting:
+        war[player] = war.get(player, 0.0) + float(w)
+
+    games = {}
+    pitched = set()
+    for player, pos, g in fielding:
+        if pos == "p":
+            pitched.add(player)
+            continue
+        slot = POSITIONS.get(pos)
+        if slot is not None:
+            by_slot = games.setdefault(player, {})
+            by_slot[slot] = by_slot.get(slot, 0) + int(g)
+
+    rows = []
+    for player, w in war.items():
+        by_slot = games.get(player)
+        if not by_slot:
+            if player in pitched:
+                continue
+            by_slot = {"dh": 0}
+        primary = max(by_slot, key=lambda s: (by_slot[s], -SLOT_ORDER.index(s)))
+        for slot in SLOT_ORDER:
+            if slot == primary or by_slot.get(slot, -1) >= min_games:
+                rows.append((slot, player, round(w, 4)))
+    return rows
+
+
+def pitcher_rows(pitching) -> list:
+    war = {}
+    for player, w in pitching:
+        war[player] = war.get(player, 0.0) + float(w)
+    return [("p", player, round(w, 4)) for player, w in war.items()]
+
+
+def aggregate(mode: str, spills: dict, min_games: int = MIN_GAMES) -> list:
+    # spills: kind -> [spill path, ...] for one partition
+    if mode == "pitchers":
+        return pitcher_rows(row for p in spills.get("pitching", ()) for row in _read_spill(p))
+    batting = [row for p in spills.get("batting", ()) for row in _read_spill(p)]
+    fielding = [row for p in spills.get("fielding", ()) for row in _read_spill(p)]
+    return hitter_rows(batting, fielding, min_games)
+
+
+def best_rows(partitions) -> list:
+    # Merges one team's partitions: best WAR per (slot, player), sorted.
+    best = {}
+    for rows in partitions:
+        for slot, player, war in rows:
+            k = (slot, player)
+            if k not in best or war > best[k]:
+                best[k] = war
+    order = {s: i for i, s in enumerate(SLOT_ORDER + ("p",))}
+    return sorted(((s, p, w) for (s, p), w in best.items()), key=lambda r: (order[r[0]], r[1].lower(), r[1]))
+
+
+# ----------------------------
+# Pipeline
+# ----------------------------
+class Ingest:
+    def __init__(self, raw: Path = RAW_DIR, work: Path = WORK_DIR, chunk_rows: int = CHUNK_ROWS,
+                 min_games: int = MIN_GAMES):
+        self.raw = Path(raw)
+        self.work = Path(work)
+        self.chunk_rows = chunk_rows
+        self.min_games = min_games
+        self.stats = {"files_read": 0, "files_kept": 0, "files_dropped": 0,
+                      "partitions_built": 0, "partitions_kept": 0, "teams_merged": 0, "teams_kept": 0}
+
+    def sync_spills(self) -> dict:
+        # Re-spills new and changed raw files; drops spills of removed ones.
+        # Returns file name -> (kind, spill index).
+        known = _read_json(self.work / "files.json", {})
+        inputs = {p.name: p for p in sorted(self.raw.glob("*.csv")) if kind_of(p)}
+        if not inputs:
+            raise PoolError(f"No batting/fielding/pitching CSVs in {self.raw}")
+
+        spills = {}
+        for name, path in inputs.items():
+            dest = self.work / "spill" / path.stem
+            sha1 = file_sha1(path)
+            index = _read_json(dest / "index.json", None)
+            if known.get(name) == sha1 and index is not None:
+                self.stats["files_kept"] += 1
+            else:
+                index = spill(path, kind_of(path), dest, self.chunk_rows)
+                known[name] = sha1
+                self.stats["files_read"] += 1
+            spills[name] = (kind_of(path), index)
+
+        for name in set(known) - set(inputs):
+            shutil.rmtree(self.work / "spill" / Path(name).stem, ignore_errors=True)
+            del known[name]
+            self.stats["files_dropped"] += 1
+        _write_json(self.work / "files.json", known)
+        return spills
+
+    def partitions(self, mode: str, spills: dict) -> dict:
+        # team -> {season: (hash, kind -> [spill path, ...])}
+        out = {}
+        for name, (kind, index) in sorted(spills.items()):
+            if kind not in MODE_KINDS[mode]:
+                continue
+            for key, sha1 in index.items():
+                team, season = key.split("/")
+                entry = out.setdefault(team, {}).setdefault(season, [[], {}])
+                entry[0].append((name, sha1))
+                entry[1].setdefault(kind, []).append(self.work / "spill" / Path(name).stem / team / f"{season}.csv")
+
+        tag = [FORMAT, self.min_games] if mode == "hitters" else [FORMAT]
+        return {
+            team: {
+                season: (hashlib.sha1(json.dumps([tag, hashes]).encode()).hexdigest(), paths)
+                for season, (hashes, paths) in seasons.items()
+            }
+            for team, seasons in out.items()
+        }
+
+    def build_mode(self, mode: str, spills: dict) -> dict:
+        # team -> canonical rows, re-aggregating only changed partitions
+        agg_dir = self.work / "agg" / mode
+        merged_path = self.work / "agg" / f"{mode}.json"
+        merged = _read_json(merged_path, {})
+        teams = {}
+
+        for team, seasons in sorted(self.partitions(mode, spills).items()):
+            team_dir = agg_dir / team
+            # drop partitions whose raw rows are gone
+            if team_dir.is_dir():
+                for f in team_dir.glob("*.json"):
+                    if f.stem not in seasons:
+                        f.unlink()
+
+            digest = hashlib.sha1(json.dumps(sorted((s, h) for s, (h, _) in seasons.items())).encode()).hexdigest()
+            cached = merged.get(team)
+            if cached and cached["hash"] == digest:
+                teams[team] = [tuple(r) for r in cached["rows"]]
+                self.stats["teams_kept"] += 1
+                self.stats["partitions_kept"] += len(seasons)
+                continue
+
+            parts = []
+            for season, (h, paths) in sorted(seasons.items()):
+                part_path = team_dir / f"{season}.json"
+                part = _read_json(part_path, None)
+                if part is None or part.get("hash") != h:
+                    part = {"hash": h, "rows": aggregate(mode, paths, self.min_games)}
+                    _write_json(part_path, part)
+                    self.stats["partitions_built"] += 1
+                else:
+                    self.stats["partitions_kept"] += 1
+                parts.append(part["rows"])
+            teams[team] = best_rows(parts)
+            merged[team] = {"hash": digest, "rows": teams[team]}
+            self.stats["teams_merged"] += 1
+
+        for team in set(merged) - set(teams):
+            del merged[team]
+            shutil.rmtree(agg_dir / team, ignore_errors=True)
+        _write_json(merged_path, merged)
+        return teams
+
+    def run(self, out_dir: Path = None, modes=tuple(MODE_KINDS)) -> dict:
+        spills = self.sync_spills()
+        written = {}
+        for mode in modes:
+            teams = self.build_mode(mode, spills)
+            path = Path(out_dir) / OUTPUTS[mode].name if out_dir else OUTPUTS[mode]
+            written[mode] = (path, write_pool(mode, teams, path))
+        return written
+
+
+def write_pool(mode: str, teams: dict, path: Path) -> bool:
+    # Writes the pool CSV atomically; False when it was already up to date.
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    if mode == "hitters":
+        w.writerow(("team", "slot", "player", "war"))
+        for team in sorted(teams):
+            w.writerows((team, s, p, str(war)) for s, p, war in teams[team])
+    else:
+        w.writerow(("team", "player", "war"))
+        for team in sorted(teams):
+            w.writerows((team, p, str(war)) for _, p, war in teams[team])
+    data = buf.getvalue().encode("utf-8")
+
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the pool CSVs from raw season-level stats, incrementally")
+    parser.add_argument("modes", nargs="*", metavar="mode", help=f"{', '.join(sorted(MODE_KINDS))} (default: all)")
+    parser.add_argument("--raw", type=Path, default=RAW_DIR, help="directory of batting/fielding/pitching CSVs")
+    parser.add_argument("--work", type=Path, default=WORK_DIR, help="spills and cached aggregates")
+    parser.add_argument("--out-dir", type=Path, help="write the pool CSVs here instead of over the repo's")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="raw rows held in memory at a time")
+    parser.add_argument("--min-games", type=int, default=MIN_GAMES, help="games at a position to qualify there")
+    parser.add_argument("--full", action="store_true", help="drop the cached state and rebuild everything")
+    args = parser.parse_args(argv)
+    unknown = set(args.modes) - set(MODE_KINDS)
+    if unknown:
+        parser.error(f"unknown mode: {', '.join(sorted(unknown))}")
+
+    if args.full:
+        shutil.rmtree(args.work, ignore_errors=True)
+    ingest = Ingest(args.raw, args.work, args.chunk_rows, args.min_games)
+    t0 = time.perf_counter()
+    written = ingest.run(args.out_dir, tuple(args.modes) or tuple(MODE_KINDS))
+    elapsed = time.perf_counter() - t0
+
+    for mode, (path, changed) in written.items():
+        print(f"{mode}: {path} {'written' if changed else 'unchanged'}")
+    for k, v in ingest.stats.items():
+        print(f"{k:<18}{v}")
+    print(f"{'seconds':<18}{elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
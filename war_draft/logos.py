@@ -0,0 +1,115 @@
+import argparse
+import base64
+from functools import lru_cache
+from pathlib import Path
+
+from war_draft.data import BASE_DIR
+
+try:
+    from PIL import Image
+except ImportError:  # resizing is optional; the originals still display
+    Image = None
+
+# Round-team logos at display size. The originals in logos/ are up to
+# 4096px and several hundred KB; the header shows them 72px tall. Resized
+# copies (1x and 2x for high-DPI screens) live in static/logos/, which
+# Streamlit serves at app/static/ when server.enableStaticServing is on, so
+# the browser fetches each logo once and caches it. Without static serving
+# the resized 1x file is inlined as a data URI, encoded once per process.
+
+LOGO_DIR = BASE_DIR / "logos"
+ASSET_DIR = BASE_DIR / "static" / "logos"
+STATIC_URL = "app/static/logos"
+HEIGHT = 72
+SCALES = (1, 2)
+
+
+def asset_name(team: str, scale: int = 1) -> str:
+    return f"{team}.png" if scale == 1 else f"{team}@{scale}x.png"
+
+
+def _resize(src: Path, dst: Path, height: int):
+    with Image.open(src) as im:
+        im = im.convert("RGBA")
+        if im.height > height:
+            width = max(1, round(im.width * height / im.height))
+            im = im.resize((width, height), Image.LANCZOS)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_suffix(".tmp")
+        im.save(tmp, format="PNG", optimize=True)
+    tmp.replace(dst)
+
+
+def asset_path(team: str, scale: int = 1):
+    # Resized logo, rebuilt if the source is newer; None if there is none.
+    # Without Pillow (or on a read-only deploy) a resized file already there
+    # is still served, even if older than its source.
+    src = LOGO_DIR / f"{team}.png"
+    dst = ASSET_DIR / asset_name(team, scale)
+    existing = dst if dst.exists() else None
+    try:
+        src_mtime = src.stat().st_mtime_ns
+    except OSError:
+        return existing
+    if existing is not None and dst.stat().st_mtime_ns >= src_mtime:
+        return dst
+    if Image is None:
+        return existing
+    try:
+        _resize(src, dst, HEIGHT * scale)
+    except OSError:  # read-only deploy
+        return existing
+    return dst
+
+
+def build_assets() -> list:
+    out = []
+    for src in sorted(LOGO_DIR.glob("*.png")):
+        for scale in SCALES:
+            path = asset_path(src.stem, scale)
+            if path is not None:
+                out.append(path)
+    return out
+
+
+@lru_cache(maxsize=64)
+def _data_uri(team: str, mtime_ns: int) -> str:
+    path = asset_path(team) or LOGO_DIR / f"{team}.png"
+    return "data:image/png;base64," + base64.b64encode(path.read_bytes()).decode()
+
+
+def data_uri(team: str):
+    # Keyed on the source mtime so an edited logo is re-encoded.
+    try:
+        mtime_ns = (LOGO_DIR / f"{team}.png").stat().st_mtime_ns
+    except OSError:
+        return None
+    return _data_uri(team, mtime_ns)
+
+
+def img_tag(team: str, static: bool = False, height: int = HEIGHT):
+    # <img> for the round team's logo, or None if the team has no logo.
+    style = f"height:{height}px; width:auto; display:block;"
+    if static and all(asset_path(team, s) is not None for s in SCALES):
+        srcset = ", ".join(f"{STATIC_URL}/{asset_name(team, s)} {s}x" for s in SCALES)
+        return f'<img src="{STATIC_URL}/{asset_name(team)}" srcset="{srcset}" style="{style}" />'
+    uri = data_uri(team)
+    if uri is None:
+        return None
+    return f'<img src="{uri}" style="{style}" />'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resize team logos into static/logos")
+    parser.parse_args(argv)
+    if Image is None:
+        raise SystemExit("Pillow is required to resize logos: pip install pillow")
+
+    paths = build_assets()
+    before = sum(p.stat().st_size for p in LOGO_DIR.glob("*.png"))
+    after = sum(p.stat().st_size for p in paths)
+    print(f"{len(paths)} assets in {ASSET_DIR} ({before / 1024:.0f} KiB -> {after / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
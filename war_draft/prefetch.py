@@ -0,0 +1,49 @@
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from war_draft import bot, engine, solver
+
+# Background preparation for the rounds a game has not reached yet. A game's
+# team order is known from the start, so the index partitions (and the bot's
+# candidate tables) for upcoming teams are built on a small shared thread
+# pool while players are still picking. The rerun that opens a round then
+# finds everything ready instead of building it.
+
+WORKERS = 2
+
+_executor = None
+_lock = threading.Lock()
+# index -> keys already submitted for it; entries go when the index does
+_submitted = weakref.WeakKeyDictionary()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(WORKERS, thread_name_prefix="war-draft-prefetch")
+    return _executor
+
+
+def submit(index, key, fn, *args):
+    # Run fn(*args) once per (index, key) in the background; None if it
+    # already ran or is running.
+    with _lock:
+        keys = _submitted.setdefault(index, set())
+        if key in keys:
+            return None
+        keys.add(key)
+        return _pool().submit(fn, *args)
+
+
+def upcoming(state, with_bot: bool = False) -> list:
+    # Futures for the work started; mostly empty once a process is warm.
+    rules, index = state.rules, state.index
+    futures = []
+    for team in engine.upcoming_teams(state):
+        futures.append(submit(index, ("team", team), index.team, team))
+        if with_bot:
+            futures.append(submit(index, ("bot", rules.name, team), bot.prepare, rules, index, team))
+    # The winner screen solves the perfect draft over every team.
+    futures.append(submit(index, ("solver", rules.name), solver.slot_table, rules, index))
+    return [f for f in futures if f is not None]
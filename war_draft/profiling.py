@@ -0,0 +1,228 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Opt-in per-rerun timing. Turn it on with WAR_DRAFT_PROFILE=1 for the whole
+# process, or with ?profile=1 on a single session. While it is off the hooks
+# cost one thread-local lookup per call. Fragment reruns are recorded on
+# their own, with the fragment's name as their scope. Each record is also
+# logged as a JSON line, to stderr or to the file WAR_DRAFT_PROFILE_LOG names.
+
+ENV_VAR = "WAR_DRAFT_PROFILE"
+LOG_ENV_VAR = "WAR_DRAFT_PROFILE_LOG"  # file for the JSON lines; stderr if unset
+HISTORY = 20
+logger = logging.getLogger("war_draft.profile")
+
+_local = threading.local()
+_installed = False
+_install_lock = threading.Lock()
+
+
+class _Collector:
+    __slots__ = ("scope", "started", "last", "phases")
+
+    def __init__(self, scope: str = "app"):
+        self.scope = scope
+        self.started = self.last = time.perf_counter()
+        self.phases = {}
+
+    def add(self, name: str, seconds: float):
+        ms, calls = self.phases.get(name, (0.0, 0))
+        self.phases[name] = (ms + seconds * 1000, calls + 1)
+        self.last = time.perf_counter()
+
+    def record(self, interrupted: bool = False) -> dict:
+        # An interrupted run is only known to have lasted until its last phase.
+        end = self.last if interrupted else time.perf_counter()
+        return {
+            "at": time.time(),
+            "scope": self.scope,
+            "total_ms": round((end - self.started) * 1000, 3),
+            "interrupted": interrupted,
+            "phases": {k: {"ms": round(ms, 3), "calls": n} for k, (ms, n) in self.phases.items()},
+        }
+
+
+@contextmanager
+def phase(name: str):
+    collector = getattr(_local, "collector", None)
+    if collector is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        collector.add(name, time.perf_counter() - t0)
+
+
+def timed(name: str):
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            collector = getattr(_local, "collector", None)
+            if collector is None:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                collector.add(name, time.perf_counter() - t0)
+
+        wrapper.__wrapped_phase__ = name
+        return wrapper
+
+    return deco
+
+
+def _install_hooks():
+    # Wrap the engine's hot calls once per process. The apps look them up on
+    # the module at call time, so every session goes through the wrappers.
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        from war_draft import bot, engine
+        from war_draft.availability import DraftAvailability
+
+        for mod, attr, name in (
+            (engine, "round_pool", "round_pool"),
+            (engine, "options", "options_for_slot"),
+            (engine, "apply_move", "apply_pick"),
+            (bot, "choose_move", "bot_move"),
+            (DraftAvailability, "slots_used", "player_slots_used_in_round"),
+        ):
+            fn = getattr(mod, attr)
+            if not hasattr(fn, "__wrapped_phase__"):
+                setattr(mod, attr, timed(name)(fn))
+        _attach_log()
+        _installed = True
+
+
+def _attach_log():
+    # Nothing else configures logging in the apps, so without a handler of
+    # its own every record would fall to the WARNING-level last resort and
+    # be dropped. A handler someone attached already is left alone.
+    if logger.handlers:
+        return
+    path = os.environ.get(LOG_ENV_VAR, "")
+    handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+# ----------------------------
+# Streamlit session glue
+# ----------------------------
+def enabled(st) -> bool:
+    if os.environ.get(ENV_VAR, "") not in ("", "0"):
+        return True
+    return st.query_params.get("profile", "") not in ("", "0")
+
+
+def begin_rerun(st, scope: str = "app") -> bool:
+    if not enabled(st):
+        _local.collector = None
+        return False
+    _install_hooks()
+
+    state = st.session_state
+    if "_profile_history" not in state:
+        state._profile_history = deque(maxlen=HISTORY)
+        state._profile_totals = {}
+
+    # st.rerun() ends a run without reaching end_rerun(); keep what it measured.
+    pending = state.get("_profile_pending")
+    if pending is not None:
+        _finish(st, pending, interrupted=True)
+
+    collector = _Collector(scope)
+    state._profile_pending = collector
+    _local.collector = collector
+    return True
+
+
+def _finish(st, collector: _Collector, interrupted: bool = False):
+    state = st.session_state
+    rec = collector.record(interrupted)
+    state._profile_pending = None
+    state._profile_history.append(rec)
+
+    totals = state._profile_totals
+    run = "rerun" if rec["scope"] == "app" else f"fragment:{rec['scope']}"
+    for name, p in list(rec["phases"].items()) + [(run, {"ms": rec["total_ms"], "calls": 1})]:
+        ms, calls = totals.get(name, (0.0, 0))
+        totals[name] = (ms + p["ms"], calls + p["calls"])
+
+    logger.info(json.dumps({"event": "rerun_profile", **rec}))
+
+
+def end_rerun(st):
+    collector = getattr(_local, "collector", None)
+    if collector is None:
+        return
+    _local.collector = None
+    _finish(st, collector)
+    render_panel(st)
+
+
+@contextmanager
+def fragment_run(st, name: str):
+    # Inside a full run the fragment is just a phase. A fragment-only rerun
+    # never reaches the top of the script, so it opens and closes its own
+    # record; the panel shows it on the next full run.
+    if getattr(_local, "collector", None) is not None:
+        with phase(name):
+            yield
+        return
+    if not begin_rerun(st, scope=name):
+        yield
+        return
+    try:
+        yield
+    finally:
+        collector = _local.collector
+        _local.collector = None
+        if collector is not None:
+            _finish(st, collector)
+
+
+def render_panel(st):
+    state = st.session_state
+    history = list(state._profile_history)
+    with st.expander("Profiling", expanded=False):
+        st.caption(f"Last {len(history)} reruns, newest first. Phases nest, so times are inclusive.")
+        rows = []
+        for rec in reversed(history):
+            row = {
+                "scope": rec.get("scope", "app"),
+                "total_ms": rec["total_ms"],
+                "rerun()": "yes" if rec["interrupted"] else "",
+            }
+            for name, p in rec["phases"].items():
+                row[f"{name} ms"] = p["ms"]
+                row[f"{name} n"] = p["calls"]
+            rows.append(row)
+        st.dataframe(rows, width="stretch")
+
+        st.caption("Cumulative totals for this session")
+        st.dataframe(
+            [
+                {"phase": k, "total_ms": round(ms, 2), "calls": n, "ms_per_call": round(ms / n, 4) if n else 0.0}
+                for k, (ms, n) in sorted(state._profile_totals.items(), key=lambda kv: -kv[1][0])
+            ],
+            width="stretch",
+        )
+        st.download_button(
+            "Download JSON",
+            data=json.dumps(history, indent=2),
+            file_name="war_draft_profile.json",
+            mime="application/json",
+        )
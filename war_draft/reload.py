@@ -0,0 +1,174 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+from war_draft import engine
+from war_draft.data import HITTER_POOL_CSV, PITCH_POOL_CSV, PoolError, load_hitter_pool, load_pitch_pool
+from war_draft.index import hitter_index, pitch_index
+
+# Pool data that follows edits to the CSVs without a restart.
+#
+# A Provider serves one mode's current index. A daemon thread polls the
+# CSV's (mtime, size); once a change has held still for one poll it loads
+# the new version off to the side. It shares every built team partition
+# whose rows did not change, rebuilds the changed ones that were already
+# in use, and then swaps the new index in with one assignment. Readers
+# only ever read that reference, so they never wait on a reload.
+#
+# Games hold the index they were started on (DraftState.index), so a game
+# in flight plays out on the data it began with. At most two versions are
+# in play: the provider keeps the one it retired until that version has no
+# unfinished games (or GRACE seconds pass) and only then loads the next.
+# A version that fails to load is logged and the current one kept.
+
+INTERVAL = float(os.environ.get("WAR_DRAFT_RELOAD_INTERVAL", "1.0"))  # 0: no watcher
+GRACE = 1800.0
+
+logger = logging.getLogger("war_draft.reload")
+
+MODES = {
+    "hitters": (engine.HITTERS, HITTER_POOL_CSV, load_hitter_pool, hitter_index),
+    "pitchers": (engine.PITCHERS, PITCH_POOL_CSV, load_pitch_pool, pitch_index),
+}
+
+
+def _stat(path: Path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def in_play(index) -> int:
+    # Unfinished games started on this index version.
+    return sum(1 for g in list(index.games) if not engine.is_over(g))
+
+
+class Provider:
+    def __init__(self, mode: str, path: Path = None, interval: float = INTERVAL, grace: float = GRACE):
+        self.mode = mode
+        self.rules, default_path, self._load_pool, self._make_index = MODES[mode]
+        self.path = Path(path or default_path)
+        self.interval = interval
+        self.grace = grace
+        self.stats = {"reloads": 0, "teams_rebuilt": 0, "teams_shared": 0, "deferred": 0, "failed": 0}
+
+        self._current = None
+        self._retired = None  # (index, retired at) while games still play on it
+        self._seen = None  # (mtime_ns, size) the current version was loaded from
+        self._pending = None  # a change waiting to hold still for one poll
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def index(self):
+        # The current version. Only the very first call loads anything.
+        current = self._current
+        if current is not None:
+            return current
+        with self._lock:
+            if self._current is None:
+                self._seen = _stat(self.path)
+                self._current = self._make_index(self._load_pool(self.path))
+                self._start()
+            return self._current
+
+    def versions(self) -> int:
+        return 1 + (self._retired is not None)
+
+    def _start(self):
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name=f"war-draft-reload-{self.mode}", daemon=True)
+            self._thread.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception:
+                logger.exception("reload check failed for %s", self.path)
+
+    def check(self) -> bool:
+        # One poll; True when a new version was swapped in.
+        with self._lock:
+            if self._current is None:
+                return False
+            try:
+                seen = _stat(self.path)
+            except OSError:
+                return False  # mid-replace or gone: keep serving
+            if seen == self._seen:
+                self._pending = None
+                return False
+            if seen != self._pending:
+                # still being written, or just written: look again next poll
+                self._pending = seen
+                return False
+            if not self._release_retired():
+                self.stats["deferred"] += 1
+                return False
+
+            old = self._current
+            try:
+                new = self._make_index(self._load_pool(self.path))
+            except (PoolError, OSError, ValueError) as e:
+                logger.warning("keeping the loaded %s pool; %s did not load: %s", self.mode, self.path, e)
+                self.stats["failed"] += 1
+                self._seen, self._pending = seen, None
+                return False
+            self._seen, self._pending = seen, None
+            if new is old:
+                return False  # touched, same content
+
+            changed = new.adopt(old)
+            # Teams that were in use come back built; the rest stay lazy.
+            hot = [t for t in changed if t in old._built]
+            new.warm(hot)
+            self.stats["teams_rebuilt"] += len(hot)
+            self.stats["teams_shared"] += len(new._built) - len(hot)
+            self.stats["reloads"] += 1
+
+            self._current = new
+            if in_play(old):
+                self._retired = (old, time.monotonic())
+            logger.info("reloaded %s: %d of %d teams changed", self.path.name, len(changed), len(new.teams))
+            return True
+
+    def _release_retired(self) -> bool:
+        # Drop the retired version once nothing plays on it; False while it
+        # still has games inside the grace period.
+        if self._retired is None:
+            return True
+        old, since = self._retired
+        if in_play(old) and time.monotonic() - since < self.grace:
+            return False
+        self._retired = None
+        return True
+
+
+# One provider per mode, shared by every session in the process.
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def provider(mode: str) -> Provider:
+    p = _providers.get(mode)
+    if p is None:
+        with _providers_lock:
+            p = _providers.setdefault(mode, Provider(mode))
+    return p
+
+
+class LiveModes(Mapping):
+    # {mode: (rules, current index)}, looked up when a game is created
+    def __getitem__(self, mode: str):
+        if mode not in MODES:
+            raise KeyError(mode)
+        return MODES[mode][0], provider(mode).index()
+
+    def __iter__(self):
+        return iter(MODES)
+
+    def __len__(self):
+        return len(MODES)
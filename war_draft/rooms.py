@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import json
+import secrets
+import time
+
+from websockets.asyncio.server import broadcast, serve
+from websockets.datastructures import Headers
+from websockets.exceptions import ConnectionClosed
+from websockets.http11 import Response
+
+from war_draft import engine
+from war_draft.api import load_modes, option_names, state_json
+from war_draft.data import BASE_DIR
+
+# Two-player drafts on two devices. Each room holds the one authoritative
+# DraftState; players connect over a websocket, and every accepted pick is
+# encoded once and pushed to everyone in the room straight away, so nobody
+# polls. A process holds many rooms: a room is a game plus two sockets,
+# and all of it runs on one event loop.
+#
+#   {"type": "create", "mode": "hitters"}        -> joined (seat A) + state
+#   {"type": "join", "room": "K7QX2M"}           -> joined (seat B) + state
+#   {"type": "join", "room": ..., "token": ...}  -> back into your seat
+#   {"type": "options", "slot": "c", "q": "rod"} -> options
+#   {"type": "pick", "slot": "c", "player": ...} -> state, to the whole room
+#
+#   python -m war_draft.rooms --port 8602   (then open http://localhost:8602/)
+
+ROOM_TTL = 30 * 60
+MAX_ROOMS = 20_000
+SWEEP_EVERY = 60
+CODE_ALPHABET = "ABCDEFGHJKMNPQRSTUVWXYZ23456789"  # no 0/O or 1/I/L
+CLIENT_PAGE = BASE_DIR / "static" / "room.html"
+
+
+class RoomError(Exception):
+    pass
+
+
+class Room:
+    __slots__ = ("code", "game", "seats", "tokens", "seen")
+
+    def __init__(self, code: str, game):
+        self.code = code
+        self.game = game
+        self.seats = dict.fromkeys(engine.LETTERS)  # letter -> connection or None
+        self.tokens = {letter: secrets.token_urlsafe(12) for letter in engine.LETTERS}
+        self.seen = time.monotonic()
+
+    def connections(self) -> list:
+        return [ws for ws in self.seats.values() if ws is not None]
+
+    def state(self, event: dict = None) -> str:
+        msg = {
+            "type": "state",
+            "room": self.code,
+            "seq": self.game.filled.bit_count(),
+            "seats": {letter: ws is not None for letter, ws in self.seats.items()},
+            "state": state_json(self.code, self.game),
+        }
+        if event:
+            msg["event"] = event
+        return json.dumps(msg, separators=(",", ":"))
+
+
+class Hub:
+    def __init__(self, modes: dict = None, ttl: float = ROOM_TTL, max_rooms: int = MAX_ROOMS):
+        self.modes = modes if modes is not None else load_modes()
+        self.ttl = ttl
+        self.max_rooms = max_rooms
+        self.rooms = {}
+
+    # ----------------------------
+    # Rooms
+    # ----------------------------
+    def new_code(self) -> str:
+        while True:
+            code = "".join(secrets.choice(CODE_ALPHABET) for _ in range(6))
+            if code not in self.rooms:
+                return code
+
+    def create(self, mode: str, seed=None) -> Room:
+        if not isinstance(mode, str) or mode not in self.modes:
+            raise RoomError(f"mode must be one of {', '.join(self.modes)}.")
+        if seed is not None and (not isinstance(seed, int) or not 0 <= seed < engine.SEEDS):
+            raise RoomError(f"seed must be an integer from 0 to {engine.SEEDS - 1}.")
+        if len(self.rooms) >= self.max_rooms:
+            self.sweep()
+            if len(self.rooms) >= self.max_rooms:
+                raise RoomError("The server is full; try again later.")
+        rules, index = self.modes[mode]
+        room = Room(self.new_code(), engine.new_game(rules, index, seed=seed))
+        self.rooms[room.code] = room
+        return room
+
+    def seat(self, room: Room, ws, token: str = None) -> str:
+        # Seat ws in room: the seat token names, else the first empty one.
+        if token is not None:
+            if not isinstance(token, str):
+                raise RoomError("That seat token is not valid for this room.")
+            for letter, t in room.tokens.items():
+                if secrets.compare_digest(t, token):
+                    old = room.seats[letter]
+                    room.seats[letter] = ws
+                    if old is not None and old is not ws:
+                        asyncio.ensure_future(old.close(4000, "Seat taken over by a new connection."))
+                    return letter
+            raise RoomError("That seat token is not valid for this room.")
+        for letter, held in room.seats.items():
+            if held is None:
+                room.seats[letter] = ws
+                return letter
+        raise RoomError("This room is full.")
+
+    def sweep(self, now: float = None):
+        # Drop rooms nobody is connected to and nobody has touched for ttl.
+        now = time.monotonic() if now is None else now
+        for code in [c for c, r in self.rooms.items() if not r.connections() and now - r.seen > self.ttl]:
+            del self.rooms[code]
+
+    async def sweeper(self):
+        while True:
+            await asyncio.sleep(SWEEP_EVERY)
+            self.sweep()
+
+    # ----------------------------
+    # Messages
+    # ----------------------------
+    async def handle(self, ws):
+        room = seat = None
+        try:
+            async for raw in ws:
+                try:
+                    msg = json.loads(raw)
+                    if not isinstance(msg, dict):
+                        raise RoomError("Messages must be JSON objects.")
+                    kind = msg.get("type")
+                    if kind in ("create", "join"):
+                        if room is not None:
+                            raise RoomError("Already in a room.")
+                        if kind == "create":
+                            target = self.create(msg.get("mode", "hitters"), msg.get("seed"))
+                        else:
+                            target = self.rooms.get(str(msg.get("room", "")).upper())
+                            if target is None:
+                                raise RoomError("No room with that code.")
+                        seat = self.seat(target, ws, msg.get("token"))
+                        room = target
+                        room.seen = time.monotonic()
+                        await ws.send(
+                            json.dumps(
+                                {"type": "joined", "room": room.code, "seat": seat, "token": room.tokens[seat]}
+                            )
+                        )
+                        broadcast(room.connections(), room.state())
+                    elif room is None:
+                        raise RoomError("Create or join a room first.")
+                    elif kind == "options":
+                        slot = msg.get("slot")
+                        if slot not in room.game.rules.slots:
+                            raise RoomError("Unknown slot.")
+                        q = msg.get("q")
+                        if q is not None and not isinstance(q, str):
+                            raise RoomError("q must be a string.")
+                        players = option_names(room.game, slot, seat, q)
+                        await ws.send(json.dumps({"type": "options", "slot": slot, "players": players}))
+                    elif kind == "pick":
+                        self.pick(room, seat, msg)
+                    else:
+                        raise RoomError(f"Unknown message type {kind!r}.")
+                except (RoomError, engine.IllegalMove, ValueError) as e:
+                    await ws.send(json.dumps({"type": "error", "error": str(e)}))
+        except ConnectionClosed:
+            pass
+        finally:
+            if room is not None and room.seats.get(seat) is ws:
+                room.seats[seat] = None
+                room.seen = time.monotonic()
+                broadcast(room.connections(), room.state())
+
+    def pick(self, room: Room, seat: str, msg: dict):
+        game = room.game
+        if engine.is_over(game):
+            raise RoomError("The draft is over.")
+        if engine.current_picker(game) != seat:
+            raise RoomError(f"Team {engine.current_picker(game)} is on the clock.")
+        slot, player = msg.get("slot"), msg.get("player")
+        if not isinstance(slot, str) or not isinstance(player, str):
+            raise RoomError("slot and player are required.")
+        pick = engine.apply_move(game, engine.Move(slot, player))
+        room.seen = time.monotonic()
+        event = {"roster": seat, "slot": slot, "message": game.rules.describe(seat, slot, pick)}
+        # Encoded once, written to every socket in the room without waiting on any.
+        broadcast(room.connections(), room.state(event))
+
+    # ----------------------------
+    # HTTP
+    # ----------------------------
+    def process_request(self, connection, request):
+        # /ws upgrades; / serves the browser client.
+        if request.path.split("?")[0] == "/ws":
+            return None
+        if request.path.split("?")[0] == "/":
+            body = CLIENT_PAGE.read_bytes()
+            headers = Headers([("Content-Type", "text/html; charset=utf-8"), ("Content-Length", str(len(body)))])
+            return Response(200, "OK", headers, body)
+        return connection.respond(404, "Not found\n")
+
+
+async def run(host: str, port: int, hub: Hub = None):
+    hub = hub if hub is not None else Hub()
+    # Small JSON frames do not need per-socket deflate state, which would
+    # cost far more memory than a room does.
+    async with serve(hub.handle, host, port, process_request=hub.process_request, compression=None) as server:
+        sweeper = asyncio.ensure_future(hub.sweeper())
+        print(f"war_draft rooms on http://{host}:{port}/", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            sweeper.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve multiplayer draft rooms over websockets")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8602)
+    parser.add_argument("--ttl", type=float, default=ROOM_TTL, help="seconds an empty room is kept")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run(args.host, args.port, Hub(ttl=args.ttl)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
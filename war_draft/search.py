@@ -0,0 +1,104 @@
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+
+# Server-side name search for the pick lists. Every (team, column) list gets
+# a NameIndex built once per process: names folded to plain lowercase ASCII,
+# a sorted token array for prefix lookups and trigram sets for typos.
+#
+# Ranking never looks at WAR, which is what players are trying to guess:
+#   0  the whole name starts with the query        "ken gr"  -> Ken Griffey
+#   1  every query word starts some name word      "griff"   -> Ken Griffey
+#   2  the query appears anywhere in the name      "ffey"    -> Ken Griffey
+#   3  close on trigrams (typos)                   "grifey"  -> Ken Griffey
+# Ties go alphabetically.
+
+TOP_K = 25
+MIN_SIMILARITY = 0.3
+
+
+def fold(text: str) -> str:
+    # "Álex Rodríguez" -> "alex rodriguez", "A.J. Cole" -> "aj cole"
+    out = []
+    for ch in unicodedata.normalize("NFKD", text):
+        if unicodedata.combining(ch):
+            continue
+        if ch.isalnum():
+            out.append(ch.casefold())
+        elif ch.isspace() or ch == "-":
+            out.append(" ")
+    return " ".join("".join(out).split())
+
+
+def _grams(folded: str) -> frozenset:
+    padded = f" {folded} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class NameIndex:
+    #   names:     display names, in the order of the list they came from
+    #   folded:    fold() of each name
+    #   tokens:    every word of every folded name, sorted
+    #   token_ids: name index for each entry of tokens
+    #   grams:     trigram set of each folded name
+    __slots__ = ("names", "folded", "tokens", "token_ids", "grams")
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.folded = tuple(fold(n) for n in self.names)
+        pairs = sorted((tok, i) for i, f in enumerate(self.folded) for tok in set(f.split()))
+        self.tokens = [t for t, _ in pairs]
+        self.token_ids = [i for _, i in pairs]
+        self.grams = tuple(_grams(f) for f in self.folded)
+
+    def _prefixed(self, prefix: str) -> set:
+        out = set()
+        tokens = self.tokens
+        for j in range(bisect_left(tokens, prefix), len(tokens)):
+            if not tokens[j].startswith(prefix):
+                break
+            out.add(self.token_ids[j])
+        return out
+
+    def rank(self, query: str, allowed=None, k: int = TOP_K) -> list:
+        # Up to k names matching query, best first; allowed limits the
+        # result to names still on offer.
+        q = fold(query)
+        if not q:
+            return [n for n in self.names if allowed is None or n in allowed][:k]
+
+        def ok(i):
+            return allowed is None or self.names[i] in allowed
+
+        scored = {}
+        words = q.split()
+        hits = self._prefixed(words[0])
+        for w in words[1:]:
+            hits &= self._prefixed(w)
+        for i in hits:
+            if ok(i):
+                scored[i] = (0 if self.folded[i].startswith(q) else 1, 0.0)
+
+        if len(scored) < k:
+            for i, f in enumerate(self.folded):
+                if i not in scored and q in f and ok(i):
+                    scored[i] = (2, 0.0)
+
+        if len(scored) < k:
+            qg = _grams(q)
+            for i, g in enumerate(self.grams):
+                if i in scored or not ok(i):
+                    continue
+                sim = len(qg & g) / len(qg | g)
+                if sim >= MIN_SIMILARITY:
+                    scored[i] = (3, -sim)
+
+        best = sorted(scored, key=lambda i: (scored[i], self.folded[i]))
+        return [self.names[i] for i in best[:k]]
+
+
+@lru_cache(maxsize=256)
+def column_index(team_pool, column: str) -> NameIndex:
+    # The team's full list for a column; availability is applied per query.
+    cands = team_pool.util_order if column == "util" else team_pool.players_at(column)
+    return NameIndex(p for p, _ in cands)
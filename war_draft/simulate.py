@@ -0,0 +1,287 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from war_draft import engine
+
+# Totals are histogrammed in 0.1 WAR bins so chunks from different
+# processes can be merged exactly.
+BIN_WIDTH = 0.1
+MAX_TOTAL = 200.0
+N_BINS = int(MAX_TOTAL / BIN_WIDTH) + 1
+
+
+# ----------------------------
+# Tables
+# ----------------------------
+class SimTables:
+    # Everything a batch of games needs, as flat NumPy arrays.
+    #   col_of_slot: (S,)       UI slot -> value column
+    #   sid:         (T, C, K)  season ids of the top-K candidates per team/column, -1 = none
+    #   war:         (T, C, K)  their WAR, -inf = none
+    # A season id names one (team, player, data slot). A pick uses up one
+    # season for the rest of the round, which is all the sim needs to know
+    # about the "already taken this round" rules. K is the number of picks
+    # per round, so the best remaining candidate is always in the top K.
+    __slots__ = ("mode", "teams", "slots", "col_of_slot", "sid", "war", "picks_per_round")
+
+    def __init__(self, mode, teams, slots, col_of_slot, sid, war, picks_per_round):
+        self.mode = mode
+        self.teams = teams
+        self.slots = slots
+        self.col_of_slot = col_of_slot
+        self.sid = sid
+        self.war = war
+        self.picks_per_round = picks_per_round
+
+    @classmethod
+    def from_index(cls, rules, index, picks_per_round: int = 2) -> "SimTables":
+        teams = tuple(index.teams)
+        slots = tuple(rules.slots)
+
+        columns = engine.slot_columns(rules)
+        col_of_slot = np.array([columns.index(engine.slot_column(rules, s)) for s in slots], dtype=np.int64)
+
+        k = picks_per_round
+        sid = np.full((len(teams), len(columns), k), -1, dtype=np.int32)
+        war = np.full((len(teams), len(columns), k), -np.inf, dtype=np.float32)
+        season_ids = {}
+
+        def season_id(team, player, data_slot):
+            return season_ids.setdefault((team, player, data_slot), len(season_ids))
+
+        for ti, team in enumerate(teams):
+            tp = index.team(team)
+            for ci, col in enumerate(columns):
+                for ki, (w, p, s) in enumerate(engine.candidates(rules, tp, col)[:k]):
+                    sid[ti, ci, ki] = season_id(team, p, s)
+                    war[ti, ci, ki] = w
+
+        return cls(rules.name, teams, slots, col_of_slot, sid, war, picks_per_round)
+
+    def expected_best(self) -> np.ndarray:
+        # mean over teams of the best WAR available at each UI slot
+        best = self.war[:, :, 0]
+        best = np.where(np.isfinite(best), best, 0.0)
+        return best.mean(axis=0)[self.col_of_slot]
+
+
+# ----------------------------
+# Pick policies
+# ----------------------------
+# A policy chooses which empty slot to fill; the pick itself is always the
+# best remaining candidate for that slot. It receives slot values (G, S)
+# with -inf for filled or empty-pool slots and returns a slot index per game.
+def greedy_policy(values, tables, rng):
+    return values.argmax(axis=1)
+
+
+def random_policy(values, tables, rng):
+    noise = rng.random(values.shape)
+    return np.where(np.isfinite(values), noise, -1.0).argmax(axis=1)
+
+
+def scarcity_policy(values, tables, rng):
+    # take the slot that beats what an average future round would offer by the most
+    return (values - tables.expected_best()).argmax(axis=1)
+
+
+POLICIES = {
+    "greedy": greedy_policy,
+    "random": random_policy,
+    "scarcity": scarcity_policy,
+}
+
+
+def get_policy(policy):
+    if callable(policy):
+        return policy
+    try:
+        return POLICIES[policy]
+    except KeyError:
+        raise ValueError(f"Unknown policy {policy!r}; choose from {sorted(POLICIES)}") from None
+
+
+# ----------------------------
+# Vectorized games
+# ----------------------------
+def snake_order(round_index: int, n_drafters: int) -> range:
+    # Same order as engine.current_picker: A first in even rounds.
+    if round_index % 2 == 0:
+        return range(n_drafters)
+    return range(n_drafters - 1, -1, -1)
+
+
+def play_batch(tables: SimTables, n_games: int, policies, rng) -> np.ndarray:
+    # Returns final totals, shape (n_games, n_drafters).
+    policies = [get_policy(p) for p in policies]
+    n_drafters = len(policies)
+    n_slots = len(tables.slots)
+    n_teams = len(tables.teams)
+    n_rounds = n_slots
+    if n_rounds > n_teams:
+        raise ValueError("Not enough teams for a full draft.")
+    if n_drafters > tables.picks_per_round:
+        raise ValueError("Tables were built for fewer picks per round.")
+
+    g = np.arange(n_games)
+    # Each game draws its round teams without replacement, like advance_pick.
+    order = rng.random((n_games, n_teams)).argsort(axis=1)[:, :n_rounds]
+
+    filled = np.zeros((n_games, n_drafters, n_slots), dtype=bool)
+    totals = np.zeros((n_games, n_drafters), dtype=np.float64)
+    col = tables.col_of_slot
+
+    for r in range(n_rounds):
+        team = order[:, r]
+        sid = tables.sid[team]  # (G, C, K)
+        war = tables.war[team]
+        used = np.full((n_games, n_drafters), -2, dtype=np.int32)
+
+        for i, d in enumerate(snake_order(r, n_drafters)):
+            # first top-K candidate per column whose season is still free
+            free = (sid[:, :, :, None] != used[:, None, None, :i]).all(axis=3) & (sid >= 0)
+            k = free.argmax(axis=2)  # (G, C)
+            has = free.any(axis=2)
+            col_war = np.where(has, np.take_along_axis(war, k[:, :, None], axis=2)[:, :, 0], -np.inf)
+            col_sid = np.take_along_axis(sid, k[:, :, None], axis=2)[:, :, 0]
+
+            values = col_war[:, col]
+            values[filled[:, d]] = -np.inf
+            choice = policies[d](values, tables, rng)
+
+            picked = values[g, choice]
+            totals[:, d] += np.where(np.isfinite(picked), picked, 0.0)
+            filled[g, d, choice] = True
+            used[:, i] = np.where(np.isfinite(picked), col_sid[g, col[choice]], -2)
+
+    return totals
+
+
+def _summarize(totals: np.ndarray) -> dict:
+    n_games, n_drafters = totals.shape
+    best = totals.max(axis=1, keepdims=True)
+    is_best = totals == best
+    sole = is_best.sum(axis=1) == 1
+    bins = np.clip(np.rint(totals / BIN_WIDTH), 0, N_BINS - 1).astype(np.int64)
+    return {
+        "games": n_games,
+        "wins": (is_best & sole[:, None]).sum(axis=0),
+        "ties": int((~sole).sum()),
+        "sum": totals.sum(axis=0),
+        "sumsq": (totals**2).sum(axis=0),
+        "hist": np.stack([np.bincount(bins[:, d], minlength=N_BINS) for d in range(n_drafters)]),
+    }
+
+
+def _merge(parts) -> dict:
+    out = dict(parts[0])
+    for p in parts[1:]:
+        for k in ("games", "wins", "ties", "sum", "sumsq", "hist"):
+            out[k] = out[k] + p[k]
+    return out
+
+
+# ----------------------------
+# Process pool
+# ----------------------------
+_worker_tables = None
+
+
+def _init_worker(tables):
+    global _worker_tables
+    _worker_tables = tables
+
+
+def _run_chunk(args):
+    n_games, policies, seed, batch = args
+    rng = np.random.default_rng(seed)
+    parts = []
+    while n_games > 0:
+        n = min(batch, n_games)
+        parts.append(_summarize(play_batch(_worker_tables, n, policies, rng)))
+        n_games -= n
+    return _merge(parts)
+
+
+def _percentile(hist: np.ndarray, q: float) -> float:
+    cdf = np.cumsum(hist)
+    return round(float(np.searchsorted(cdf, q / 100.0 * cdf[-1]) * BIN_WIDTH), 1)
+
+
+def simulate(
+    tables: SimTables, n_games: int, policies=("greedy", "greedy"), seed=None, workers=None, batch=20000
+) -> dict:
+    workers = workers or os.cpu_count() or 1
+    n_chunks = max(1, min(workers * 4, -(-n_games // batch)))
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    sizes = [n_games // n_chunks + (1 if i < n_games % n_chunks else 0) for i in range(n_chunks)]
+    jobs = [(n, tuple(policies), s, batch) for n, s in zip(sizes, seeds) if n]
+
+    if workers == 1:
+        _init_worker(tables)
+        parts = [_run_chunk(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(tables,)) as ex:
+            parts = list(ex.map(_run_chunk, jobs))
+    merged = _merge(parts)
+
+    n = merged["games"]
+    letters = [chr(ord("A") + d) for d in range(len(policies))]
+    mean = merged["sum"] / n
+    std = np.sqrt(np.maximum(merged["sumsq"] / n - mean**2, 0.0))
+    win_rate = merged["wins"] / n
+
+    return {
+        "mode": tables.mode,
+        "games": int(n),
+        "policies": dict(zip(letters, [p if isinstance(p, str) else p.__name__ for p in policies])),
+        "win_rate": dict(zip(letters, win_rate.round(5).tolist())),
+        "tie_rate": round(merged["ties"] / n, 5),
+        # A is first on the clock in round 1
+        "first_pick_advantage": round(float(win_rate[0] - win_rate[-1]), 5),
+        "total_war": {
+            letter: {
+                "mean": round(float(mean[d]), 3),
+                "std": round(float(std[d]), 3),
+                "percentiles": {q: _percentile(merged["hist"][d], q) for q in (5, 25, 50, 75, 95)},
+            }
+            for d, letter in enumerate(letters)
+        },
+    }
+
+
+def load_tables(mode: str) -> SimTables:
+    from war_draft.data import load_hitter_pool, load_pitch_pool
+    from war_draft.index import hitter_index, pitch_index
+
+    if mode == "hitters":
+        return SimTables.from_index(engine.HITTERS, hitter_index(load_hitter_pool()))
+    return SimTables.from_index(engine.PITCHERS, pitch_index(load_pitch_pool()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo WAR draft simulator")
+    parser.add_argument("--mode", choices=["hitters", "pitchers"], default="hitters")
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--policy-a", default="greedy", choices=sorted(POLICIES))
+    parser.add_argument("--policy-b", default="greedy", choices=sorted(POLICIES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    tables = load_tables(args.mode)
+    t0 = time.perf_counter()
+    result = simulate(tables, args.games, (args.policy_a, args.policy_b), seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    result["seconds"] = round(elapsed, 3)
+    result["games_per_minute"] = int(args.games / elapsed * 60)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from war_draft import engine
+
+# The "perfect draft" for one roster: given the team that came up in each
+# round, assign rounds to roster slots so the total WAR is as high as
+# possible. Within a round a roster makes one pick, so each (round, slot)
+# pair is simply worth the best WAR that team offers at that slot and the
+# problem is a square assignment problem.
+
+
+# ----------------------------
+# Tables
+# ----------------------------
+class SlotTable:
+    #   teams:       (T,)
+    #   columns:     distinct value columns (OF slots share one)
+    #   col_of_slot: (S,) UI slot -> column
+    #   war:         (T, C) best WAR a team offers in each column
+    #   best:        {(team, column): (player, war, data_slot)}
+    __slots__ = ("rules", "teams", "team_pos", "columns", "col_of_slot", "war", "best")
+
+    def __init__(self, rules, index):
+        self.rules = rules
+        self.teams = tuple(index.teams)
+        self.team_pos = {t: i for i, t in enumerate(self.teams)}
+
+        self.columns = columns = engine.slot_columns(rules)
+        self.col_of_slot = np.array([columns.index(engine.slot_column(rules, s)) for s in rules.slots])
+
+        self.war = np.zeros((len(self.teams), len(columns)), dtype=np.float64)
+        self.best = {}
+        for ti, team in enumerate(self.teams):
+            tp = index.team(team)
+            for ci, col in enumerate(columns):
+                cands = engine.candidates(rules, tp, col)
+                if cands:
+                    w, p, s = cands[0]
+                    self.war[ti, ci] = w
+                    self.best[(team, col)] = (p, w, s)
+
+    def weights(self, team_seq) -> np.ndarray:
+        # (rounds, slots) WAR for filling each slot in each round
+        rows = [self.team_pos[t] for t in team_seq]
+        return self.war[rows][:, self.col_of_slot]
+
+
+def slot_table(rules, index) -> SlotTable:
+    return index.derived(("solver", rules), lambda: SlotTable(rules, index))
+
+
+# ----------------------------
+# Hungarian algorithm
+# ----------------------------
+def hungarian(cost) -> list:
+    # Minimum-cost assignment for an n x m cost matrix with n <= m.
+    # Returns the column assigned to each row (shortest augmenting paths
+    # with potentials, O(n^2 m)).
+    n, m = len(cost), len(cost[0])
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    out = [0] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            out[p[j] - 1] = j - 1
+    return out
+
+
+def perfect_draft(table: SlotTable, team_seq) -> tuple:
+    # (total WAR, {ui_slot: (team, player, war, data_slot)}) for one roster
+    w = table.weights(team_seq)
+    cols = hungarian((-w).tolist())
+
+    slots = table.rules.slots
+    total = 0.0
+    picks = {}
+    for r, s in enumerate(cols):
+        team = team_seq[r]
+        hit = table.best.get((team, table.columns[table.col_of_slot[s]]))
+        if hit is None:
+            continue
+        player, war, data_slot = hit
+        picks[slots[s]] = (team, player, war, data_slot)
+        total += war
+    return total, picks
+
+
+# ----------------------------
+# Batch
+# ----------------------------
+def perfect_totals(table: SlotTable, sequences) -> np.ndarray:
+    # Best total for many team sequences at once, shape (B,).
+    # Slots that share a column are interchangeable, so the assignment
+    # reduces to a DP over how many slots of each column are filled. That is
+    # the same optimum the Hungarian solve finds, vectorized across the
+    # batch: product of (multiplicity + 1) states instead of S! orders.
+    seq = np.asarray([[table.team_pos[t] for t in s] for s in sequences], dtype=np.int64)
+    n_batch, n_rounds = seq.shape
+    mult = np.bincount(table.col_of_slot, minlength=len(table.columns))
+    if n_rounds != mult.sum():
+        raise ValueError(f"Expected {mult.sum()} rounds, got {n_rounds}.")
+
+    radix = np.cumprod(np.concatenate([[1], mult[:-1] + 1]))
+    n_states = int(np.prod(mult + 1))
+    counts = (np.arange(n_states)[:, None] // radix) % (mult + 1)  # (states, C)
+    depth = counts.sum(axis=1)
+
+    dp = np.full((n_batch, n_states), -np.inf)
+    dp[:, 0] = 0.0
+    for state in np.argsort(depth, kind="stable"):
+        r = depth[state]
+        if r == n_rounds or not np.isfinite(dp[:, state]).any():
+            continue
+        w = table.war[seq[:, r]]  # (B, C)
+        for c in range(len(mult)):
+            if counts[state, c] < mult[c]:
+                nxt = state + radix[c]
+                np.maximum(dp[:, nxt], dp[:, state] + w[:, c], out=dp[:, nxt])
+    return dp[:, n_states - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perfect-draft solver for a sequence of round teams")
+    parser.add_argument("--mode", choices=["hitters", "pitchers"], default="hitters")
+    parser.add_argument("--teams", help="comma-separated round teams, one per round")
+    parser.add_argument("--batch", type=int, default=0, help="solve this many random sequences and time it")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from war_draft.data import load_hitter_pool, load_pitch_pool
+    from war_draft.index import hitter_index, pitch_index
+
+    if args.mode == "hitters":
+        rules, index = engine.HITTERS, hitter_index(load_hitter_pool())
+    else:
+        rules, index = engine.PITCHERS, pitch_index(load_pitch_pool())
+    table = slot_table(rules, index)
+    rng = random.Random(args.seed)
+
+    if args.batch:
+        seqs = [rng.sample(table.teams, len(rules.slots)) for _ in range(args.batch)]
+        t0 = time.perf_counter()
+        totals = perfect_totals(table, seqs)
+        elapsed = time.perf_counter() - t0
+        print(f"{args.batch} sequences in {elapsed * 1000:.1f} ms, mean perfect total {totals.mean():.2f} WAR")
+        return
+
+    teams = args.teams.split(",") if args.teams else rng.sample(table.teams, len(rules.slots))
+    total, picks = perfect_draft(table, teams)
+    for slot in rules.slots:
+        if slot in picks:
+            team, player, war, data_slot = picks[slot]
+            print(f"{rules.slot_label(slot):>4}  {team:<13} {player:<28} {war:5.1f}")
+    print(f"Perfect total: {total:.1f} WAR")
+
+
+if __name__ == "__main__":
+    main()